@@ -14,11 +14,31 @@ warnings about contradictions, ambiguities, and context issues.
 
 import sys
 import argparse
-import requests
-import json
+import asyncio
+import platform
+import threading
+import httpx
 from typing import Optional
 import time
 
+# orjson is a C extension with no PyPy build; under PyPy the JIT makes stdlib json fast enough
+if platform.python_implementation() != "PyPy":
+    import orjson
+    
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+    
+    def _json_pretty(data) -> str:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+else:
+    import json
+    
+    def _json_loads(data: bytes):
+        return json.loads(data)
+    
+    def _json_pretty(data) -> str:
+        return json.dumps(data, indent=2)
+
 API_BASE = "http://localhost:8000/v0"
 
 class Colors:
@@ -41,48 +61,48 @@ class LideCLI:
         self.api_base = api_base
         self.current_session_id: Optional[str] = None
         
-    def check_backend(self) -> bool:
+        # Reuse one keep-alive (HTTP/2 where negotiated) connection pool for every backend call
+        self.http = httpx.AsyncClient(
+            base_url=self.api_base,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+            ),
+            timeout=httpx.Timeout(30.0, connect=1.0)
+        )
+    
+    async def check_backend(self) -> bool:
         """Check if backend is running"""
         try:
-            response = requests.get(f"{self.api_base}/health", timeout=2)
+            response = await self.http.get("/health", timeout=2)
             return response.status_code == 200
-        except requests.exceptions.RequestException:
+        except httpx.HTTPError:
             return False
     
-    def create_session(self, initial_text: str = "") -> str:
+    async def create_session(self, initial_text: str = "") -> str:
         """Create a new session"""
-        response = requests.post(
-            f"{self.api_base}/sessions",
+        response = await self.http.post(
+            "/sessions",
             json={"text": initial_text, "lang": "en"}
         )
         response.raise_for_status()
-        return response.json()["id"]
+        return _json_loads(response.content)["id"]
     
-    def send_message(self, text: str, session_id: str) -> dict:
+    async def send_message(self, text: str, session_id: str) -> dict:
         """Send a message for analysis"""
-        # Create document
-        doc_response = requests.post(
-            f"{self.api_base}/docs",
-            json={"text": text, "lang": "en"}
-        )
-        doc_response.raise_for_status()
-        doc_id = doc_response.json()["id"]
-        
-        # Analyze
-        analyze_response = requests.post(
-            f"{self.api_base}/analyze",
+        # Create, analyze and fetch the graph in a single round trip
+        response = await self.http.post(
+            "/analyze_text",
             json={
-                "docId": doc_id,
+                "text": text,
+                "lang": "en",
                 "options": {"processing_mode": "Map"}
             }
         )
-        analyze_response.raise_for_status()
-        
-        # Get graph
-        graph_response = requests.get(f"{self.api_base}/docs/{doc_id}/graph")
-        graph_response.raise_for_status()
+        response.raise_for_status()
         
-        return graph_response.json()
+        return _json_loads(response.content)
     
     def display_diagnostics(self, graph: dict):
         """Display diagnostics in terminal with color coding"""
@@ -92,32 +112,38 @@ class LideCLI:
             print(f"{Colors.OKGREEN}✓ No issues detected{Colors.ENDC}")
             return
         
-        print(f"\n{Colors.BOLD}=== L-ide Diagnostics ==={Colors.ENDC}\n")
-        
-        # Group by severity
-        errors = [d for d in diagnostics if d.get("severity") == "error"]
-        warnings = [d for d in diagnostics if d.get("severity") == "warning"]
+        # Build the whole report first and write it once instead of one write per line
+        out = [f"\n{Colors.BOLD}=== L-ide Diagnostics ==={Colors.ENDC}\n"]
         
+        # Group by severity in one pass (backend severities are "Error"/"Warning"/"Info")
+        buckets = {"error": [], "warning": []}
+        for d in diagnostics:
+            bucket = buckets.get(str(d.get("severity", "")).lower())
+            if bucket is not None:
+                bucket.append(d)
+        errors = buckets["error"]
+        warnings = buckets["warning"]
+
         if errors:
-            print(f"{Colors.FAIL}ERRORS:{Colors.ENDC}")
-            for diag in errors:
-                print(f"  ❌ [{diag['kind']}] {diag['message']}")
-            print()
+            out.append(f"{Colors.FAIL}ERRORS:{Colors.ENDC}")
+            out.extend(f"  ❌ [{diag['kind']}] {diag['message']}" for diag in errors)
+            out.append("")
         
         if warnings:
-            print(f"{Colors.WARNING}WARNINGS:{Colors.ENDC}")
-            for diag in warnings:
-                print(f"  ⚠️  [{diag['kind']}] {diag['message']}")
-            print()
+            out.append(f"{Colors.WARNING}WARNINGS:{Colors.ENDC}")
+            out.extend(f"  ⚠️  [{diag['kind']}] {diag['message']}" for diag in warnings)
+            out.append("")
         
         # Show stats
         node_count = len(graph.get("nodes", []))
         edge_count = len(graph.get("edges", []))
-        print(f"{Colors.OKCYAN}Graph: {node_count} nodes, {edge_count} edges{Colors.ENDC}")
+        out.append(f"{Colors.OKCYAN}Graph: {node_count} nodes, {edge_count} edges{Colors.ENDC}")
+        
+        sys.stdout.write("\n".join(out) + "\n")
     
-    def attach_mode(self, session_id: Optional[str] = None):
+    async def attach_mode_async(self, session_id: Optional[str] = None):
         """Enter interactive attach mode"""
-        if not self.check_backend():
+        if not await self.check_backend():
             print(f"{Colors.FAIL}Error: L-ide backend is not running{Colors.ENDC}")
             print("Start it with: cd prototype/backend && uvicorn main:app --reload")
             return 1
@@ -127,7 +153,7 @@ class LideCLI:
             self.current_session_id = session_id
             print(f"{Colors.OKGREEN}Attached to session: {session_id}{Colors.ENDC}")
         else:
-            self.current_session_id = self.create_session()
+            self.current_session_id = await self.create_session()
             print(f"{Colors.OKGREEN}Created new session: {self.current_session_id}{Colors.ENDC}")
         
         print(f"\n{Colors.BOLD}L-ide is monitoring your conversation{Colors.ENDC}")
@@ -139,7 +165,7 @@ class LideCLI:
             while True:
                 # Get user input
                 try:
-                    text = input(f"{Colors.OKCYAN}You:{Colors.ENDC} ")
+                    text = await _ainput(f"{Colors.OKCYAN}You:{Colors.ENDC} ")
                 except EOFError:
                     break
                 
@@ -154,7 +180,7 @@ class LideCLI:
                 # Analyze message
                 print(f"{Colors.OKBLUE}Analyzing...{Colors.ENDC}", end='\r')
                 try:
-                    graph = self.send_message(text, self.current_session_id)
+                    graph = await self.send_message(text, self.current_session_id)
                     print(" " * 50, end='\r')  # Clear "Analyzing..."
                     self.display_diagnostics(graph)
                 except Exception as e:
@@ -162,7 +188,7 @@ class LideCLI:
                 
                 print()  # Blank line for readability
         
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print(f"\n\n{Colors.WARNING}Interrupted by user{Colors.ENDC}")
         
         print(f"\n{Colors.OKGREEN}Session complete!{Colors.ENDC}")
@@ -172,52 +198,105 @@ class LideCLI:
         
         return 0
     
-    def list_sessions(self):
+    async def list_sessions(self):
         """List all sessions"""
-        if not self.check_backend():
+        # Sessions arrive as newline-delimited JSON and are printed as they come in
+        count = 0
+        try:
+            async with self.http.stream("GET", "/sessions/stream") as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    session = _json_loads(line)
+                    
+                    if count == 0:
+                        print(f"\n{Colors.BOLD}Sessions:{Colors.ENDC}\n")
+                    count += 1
+                    
+                    # One write per session, so each still renders as soon as it arrives
+                    out = [
+                        f"  {Colors.OKCYAN}{session['id']}{Colors.ENDC}",
+                        f"    Created: {session['created_at']}",
+                        f"    Nodes: {session['node_count']}, Edges: {session['edge_count']}"
+                    ]
+                    if session['diagnostic_count'] > 0:
+                        out.append(f"    Diagnostics: {Colors.WARNING}{session['diagnostic_count']}{Colors.ENDC}")
+                    sys.stdout.write("\n".join(out) + "\n\n")
+                    sys.stdout.flush()
+        except httpx.TransportError:
             print(f"{Colors.FAIL}Error: Backend not running{Colors.ENDC}")
             return 1
         
-        response = requests.get(f"{self.api_base}/sessions")
-        response.raise_for_status()
-        sessions = response.json()
-        
-        if not sessions:
+        if not count:
             print("No sessions found")
-            return 0
-        
-        print(f"\n{Colors.BOLD}Sessions:{Colors.ENDC}\n")
-        for session in sessions:
-            print(f"  {Colors.OKCYAN}{session['id']}{Colors.ENDC}")
-            print(f"    Created: {session['created_at']}")
-            print(f"    Nodes: {session['node_count']}, Edges: {session['edge_count']}")
-            if session['diagnostic_count'] > 0:
-                print(f"    Diagnostics: {Colors.WARNING}{session['diagnostic_count']}{Colors.ENDC}")
-            print()
         
         return 0
     
-    def export_session(self, session_id: str, format: str = "markdown"):
+    async def export_session(self, session_id: str, format: str = "markdown"):
         """Export a session"""
-        if not self.check_backend():
+        # Overlap the health check with the export request
+        healthy, response = await asyncio.gather(
+            self.check_backend(),
+            self.http.get(
+                f"/sessions/{session_id}/export",
+                params={"format": format}
+            ),
+            return_exceptions=True
+        )
+        if healthy is not True:
             print(f"{Colors.FAIL}Error: Backend not running{Colors.ENDC}")
             return 1
+        if isinstance(response, Exception):
+            raise response
         
-        response = requests.get(
-            f"{self.api_base}/sessions/{session_id}/export",
-            params={"format": format}
-        )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
         
         if format == "markdown":
             print(data["content"])
         else:
-            print(json.dumps(data, indent=2))
+            print(_json_pretty(data))
         
         return 0
 
 
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop"""
+    # A daemon thread (rather than asyncio.to_thread) so Ctrl-C doesn't wait on a pending input()
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def _resolve(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def _read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(_resolve, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(_resolve, future.set_result, line)
+    
+    threading.Thread(target=_read, daemon=True).start()
+    return await future
+
+
+async def _run_command(cli: LideCLI, args) -> int:
+    """Dispatch a parsed command on the CLI's event loop"""
+    try:
+        if args.command == 'attach':
+            return await cli.attach_mode_async(args.session)
+        elif args.command == 'list':
+            return await cli.list_sessions()
+        elif args.command == 'export':
+            return await cli.export_session(args.session_id, args.format)
+        return 0
+    finally:
+        await cli.http.aclose()
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -257,14 +336,10 @@ Examples:
     
     cli = LideCLI()
     
-    if args.command == 'attach':
-        return cli.attach_mode(args.session)
-    elif args.command == 'list':
-        return cli.list_sessions()
-    elif args.command == 'export':
-        return cli.export_session(args.session_id, args.format)
-    
-    return 0
+    try:
+        return asyncio.run(_run_command(cli, args))
+    except KeyboardInterrupt:
+        return 130
 
 
 if __name__ == "__main__":
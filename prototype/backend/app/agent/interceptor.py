@@ -1,5 +1,6 @@
+import itertools
 from typing import Optional
-from app.pipeline import Pipeline
+from app.pipeline import get_pipeline
 from app.agent.session import SessionManager
 from app.checkers.continuity import ContinuityChecker
 from app.checkers.oxymoron import OxymoronChecker
@@ -13,11 +14,13 @@ class Interceptor:
     It analyzes user input, updates the session graph, and checks for contradictions.
     """
     def __init__(self):
-        self.pipeline = Pipeline()
+        self.pipeline = get_pipeline()
         self.checker = ContinuityChecker()
         self.oxymoron_checker = OxymoronChecker()
         self.ambiguity_checker = AmbiguityChecker()
         self.resolver = CoreferenceResolver()
+        # Per-turn doc IDs never leave the process, so a counter is enough
+        self._turn_ids = itertools.count(1)
 
     def check_and_inject(self, user_message: str, session: SessionManager) -> Optional[str]:
         """
@@ -27,52 +30,49 @@ class Interceptor:
         # 1. Run Pipeline on new message
         # Note: We generate a fresh graph for this turn
         # In a real system, we'd pass the history context to the pipeline/LLM
-        import uuid
-        doc_id = str(uuid.uuid4())
+        doc_id = f"turn_{next(self._turn_ids)}"
         turn_graph = self.pipeline.process(user_message, doc_id)
 
         # 2. Update Session Graph
         session.update_graph(turn_graph)
         session.add_history(user_message, doc_id)
 
-        # 3. Run Coreference Resolution on the FULL Session Graph
-        # This links "It" in the new turn to "The building" in previous turns
-        full_graph = session.get_graph()
-        full_graph = self.resolver.resolve(None, full_graph)
-
-        # 4. Run Continuity Checker on the FULL Session Graph
-        # This checks if the new assertions contradict ANY previous assertions
-        errors = self.checker.check(full_graph)
-
-        # 5. Run Oxymoron Checker on the TURN Graph
+        # 3. Run Oxymoron Checker on the TURN Graph
+        # The turn-local checks are cheap, so they run first and return on the first hit
+        # (Priority 1: Oxymorons - Confusion)
         oxymorons = self.oxymoron_checker.check(turn_graph)
-        
-        # 6. Run Ambiguity Checker on the TURN Graph
-        # We check if the user's NEW input is vague
-        ambiguities = self.ambiguity_checker.check(turn_graph)
-
-        # 7. Generate System Warning (Priority Order)
-        
-        # Priority 1: Oxymorons (Confusion)
         if oxymorons:
-            oxy = oxymorons[0]
-            try:
-                terms_part = oxy.message.split('(')[1].split(')')[0]
-                terms = terms_part.replace(' and ', ' ')
-            except:
-                terms = "contradictory terms"
+            terms = " ".join(oxymorons[0].terms) or "contradictory terms"
             
             return (
                 f"[SYSTEM WARNING: Contradiction detected. "
                 f"I was thinking \"{terms}\" would be unclear, should this sentence make sense?]"
             )
 
-        # Priority 2: Ambiguity (Clarification needed before acting)
+        # 4. Run Ambiguity Checker on the TURN Graph
+        # We check if the user's NEW input is vague
+        # (Priority 2: Ambiguity - Clarification needed before acting)
+        ambiguities = self.ambiguity_checker.check(turn_graph)
         if ambiguities:
             amb = ambiguities[0]
             return f"[SYSTEM WARNING: Ambiguity detected. {amb.message} Please clarify.]"
 
-        # Priority 3: Continuity (History contradiction)
+        # 5. Run Coreference Resolution for the nodes added since the last check
+        # This links "It" in the new turn to "The building" in previous turns.
+        # Turns that returned early above stay unprocessed and are picked up here next time;
+        # the session's coref state remembers the antecedents from the turns before.
+        full_graph = session.get_graph()
+        full_graph = self.resolver.resolve(
+            None, full_graph, new_nodes=session.unprocessed().nodes, state=session.get_coref_state()
+        )
+
+        # 6. Run Continuity Checker on the new assertions (incl. the SameAs edges just added)
+        # This checks if the new assertions contradict ANY previous assertions,
+        # using the session's running index instead of re-grouping the whole history
+        # (Priority 3: Continuity - History contradiction)
+        errors = self.checker.check_incremental(full_graph, session.unprocessed(), session.get_continuity_index())
+        session.mark_processed()
+
         if errors:
             error = errors[0]
             return (
@@ -83,3 +83,12 @@ class Interceptor:
             )
         
         return None
+
+# Singleton instance
+_interceptor_instance = None
+
+def get_interceptor():
+    global _interceptor_instance
+    if _interceptor_instance is None:
+        _interceptor_instance = Interceptor()
+    return _interceptor_instance
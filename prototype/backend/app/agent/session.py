@@ -1,5 +1,7 @@
 from typing import Dict, List, Optional
 from app.models import MeaningGraph, Node, Edge, Assertion
+from app.checkers.continuity import ContinuityIndex
+from app.coref import CorefState
 
 class SessionManager:
     """
@@ -8,6 +10,13 @@ class SessionManager:
     def __init__(self):
         self.graph = MeaningGraph(nodes=[], edges=[], assertions=[])
         self.history: List[Dict[str, str]] = [] # Keep track of history with doc_ids
+        
+        # How far into each list the per-turn checks have already looked
+        self._processed_nodes = 0
+        self._processed_edges = 0
+        self._processed_assertions = 0
+        self.continuity_index = ContinuityIndex()
+        self.coref_state = CorefState()
 
     def update_graph(self, new_graph: MeaningGraph):
         """
@@ -31,6 +40,28 @@ class SessionManager:
     def get_graph(self) -> MeaningGraph:
         return self.graph
 
+    def unprocessed(self) -> MeaningGraph:
+        """
+        Returns the nodes/edges/assertions appended since the last mark_processed(),
+        so per-turn checks only look at what is new instead of the whole session.
+        """
+        return MeaningGraph(
+            nodes=self.graph.nodes[self._processed_nodes:],
+            edges=self.graph.edges[self._processed_edges:],
+            assertions=self.graph.assertions[self._processed_assertions:]
+        )
+
+    def mark_processed(self):
+        self._processed_nodes = len(self.graph.nodes)
+        self._processed_edges = len(self.graph.edges)
+        self._processed_assertions = len(self.graph.assertions)
+
+    def get_continuity_index(self) -> ContinuityIndex:
+        return self.continuity_index
+
+    def get_coref_state(self) -> CorefState:
+        return self.coref_state
+
     def add_history(self, text: str, doc_id: str):
         self.history.append({"text": text, "doc_id": doc_id})
 
@@ -3,42 +3,46 @@ from app.models import (
     AmbiguitySet, AmbiguityDimension, AmbiguityAlternative, 
     Diagnostic, DiagnosticKind, Severity, Provenance, Span
 )
-import uuid
+import re
+from app.ids import fast_id
+
+# Terms flagged as potentially vague (e.g. "uneasy" in Kafka's sentence)
+VAGUE_TERMS = ["uneasy", "somewhat", "possibly", "maybe"]
 
 class AmbiguityManager:
     def __init__(self):
         self.engine_id = "rule-based-ambiguity"
         self.version = "0.1.0"
+        # One case-insensitive pass over the text finds every vague term with its span
+        self._vague_re = re.compile(r"\b(" + "|".join(map(re.escape, VAGUE_TERMS)) + r")\b", re.IGNORECASE)
+        # Case-insensitive searches instead of lowercasing a copy of the whole text
+        self._transformed_re = re.compile("transformed", re.IGNORECASE)
+        self._insect_re = re.compile("insect", re.IGNORECASE)
 
     def detect_ambiguities(self, text: str, doc_id: str) -> tuple[List[AmbiguitySet], List[Diagnostic]]:
         ambiguity_sets = []
         diagnostics = []
         
         # 1. Vagueness Detection (Rule-based for prototype)
-        # Example: "uneasy" in Kafka's sentence
-        vague_terms = ["uneasy", "somewhat", "possibly", "maybe"]
-        for term in vague_terms:
-            if term in text.lower():
-                start_idx = text.lower().find(term)
-                if start_idx != -1:
-                    end_idx = start_idx + len(term)
-                    diagnostics.append(Diagnostic(
-                        kind=DiagnosticKind.VAGUENESS,
-                        severity=Severity.INFO,
-                        message=f"Term '{term}' is potentially vague.",
-                        provenance=[Provenance(
-                            engine_id=self.engine_id,
-                            engine_version=self.version,
-                            source_doc=doc_id,
-                            span=Span(start=start_idx, end=end_idx, text=text[start_idx:end_idx])
-                        )]
-                    ))
+        for match in self._vague_re.finditer(text):
+            term = match.group(0).lower()
+            diagnostics.append(Diagnostic(
+                kind=DiagnosticKind.VAGUENESS,
+                severity=Severity.INFO,
+                message=f"Term '{term}' is potentially vague.",
+                provenance=[Provenance(
+                    engine_id=self.engine_id,
+                    engine_version=self.version,
+                    source_doc=doc_id,
+                    span=Span(start=match.start(), end=match.end(), text=match.group(0))
+                )]
+            ))
 
         # 2. Figurative vs Literal Ambiguity (Kafka Example)
         # "transformed into a gigantic insect"
-        if "transformed" in text.lower() and "insect" in text.lower():
+        if self._transformed_re.search(text) and self._insect_re.search(text):
             # Create AmbiguitySet for the transformation
-            amb_id = f"amb_{uuid.uuid4().hex[:8]}"
+            amb_id = f"amb_{fast_id(4)}"
             amb_set = AmbiguitySet(
                 id=amb_id,
                 dimension=AmbiguityDimension.AMB_FIG,
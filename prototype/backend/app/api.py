@@ -1,12 +1,22 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
+import asyncio
 import uuid
+import traceback
 from datetime import datetime
 
 from app.models import (
-    CreateDocRequest, DocResponse, AnalyzeRequest, AnalysisSummary, MeaningGraph
+    CreateDocRequest, DocResponse, AnalyzeRequest, AnalysisSummary, MeaningGraph,
+    AnalyzeOptions, AnalyzeTextRequest, TextAnalysisResponse, ProcessingMode
 )
 from pydantic import BaseModel
+from app.pipeline import get_pipeline
+from app.interpreters import get_interpreter
+from app.logic import LogicEngine
+from app.plugins import registry
+from plugins.truth_checker import TruthCheckerPlugin
+from plugins.discourse import DiscoursePlugin
 
 router = APIRouter()
 
@@ -35,12 +45,28 @@ async def capabilities():
         "modes": ["Map", "Fiction", "Truth"]
     }
 
-# Register Plugins (Prototype)
-from app.plugins import registry
-from plugins.truth_checker import TruthCheckerPlugin
-from plugins.discourse import DiscoursePlugin
-registry.register(TruthCheckerPlugin())
-registry.register(DiscoursePlugin())
+def register_plugins():
+    """
+    Register the bundled plugins (prototype). Called once per startup from the
+    app's lifespan (main.py) rather than on import.
+    """
+    for plugin in (TruthCheckerPlugin(), DiscoursePlugin()):
+        # `uvicorn --reload` can start the app again in a process whose registry is already filled
+        if not registry.is_registered(plugin.engine_id):
+            registry.register(plugin)
+
+def warm_pipeline():
+    """
+    Load the spaCy model and run one analysis through every mode before serving traffic,
+    so the first /analyze doesn't pay for model loading and first-call setup.
+    Called once per startup from the app's lifespan (main.py).
+    """
+    try:
+        graph = get_pipeline().process("The cat sat on the mat.", "warmup")
+        for mode in ProcessingMode:
+            get_interpreter(mode).interpret(graph)
+    except Exception as e:
+        print(f"Pipeline warmup failed: {e}")
 
 @router.post("/docs", response_model=DocResponse)
 async def create_doc(request: CreateDocRequest):
@@ -59,69 +85,103 @@ async def delete_doc(doc_id: str):
     deleted = storage.delete_document(doc_id)
     return {"status": "deleted" if deleted else "not_found"}
 
-@router.post("/analyze", response_model=AnalysisSummary)
-async def analyze_doc(request: AnalyzeRequest, background_tasks: BackgroundTasks):
-    doc = storage.get_document(request.docId)
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+def _interpret(doc_id: str, text: str, options: Optional[AnalyzeOptions]) -> MeaningGraph:
+    """Runs pipeline + interpreter on a document (CPU-bound, no storage access)."""
+    pipeline = get_pipeline()
+    graph = pipeline.process(text, doc_id)
     
+    # Apply Interpreter
+    options = options or AnalyzeOptions()
+    interpreter = get_interpreter(options.processing_mode)
+    return interpreter.interpret(graph)
+
+async def _run_analysis(doc_id: str, text: str, options: Optional[AnalyzeOptions]) -> MeaningGraph:
+    """Runs pipeline + interpreter on a document and persists the resulting graph."""
     try:
-        from app.pipeline import get_pipeline
-        pipeline = get_pipeline()
+        # The parse and the save (serialize + compress + write) run on worker threads
+        # so the event loop keeps serving other requests; each thread has its own connection
+        graph = await asyncio.to_thread(_interpret, doc_id, text, options)
         
-        # Run pipeline (synchronously for now for simplicity, can be backgrounded)
-        graph = pipeline.process(doc.text, request.docId)
-        
-        # Apply Interpreter
-        from app.interpreters import get_interpreter
-        from app.models import AnalyzeOptions
-        options = request.options or AnalyzeOptions()
-        interpreter = get_interpreter(options.processing_mode)
-        graph = interpreter.interpret(graph)
-        
-        storage.save_graph(request.docId, graph)
-        
-        return AnalysisSummary(
-            docId=request.docId,
-            graph_summary={"nodes": len(graph.nodes), "edges": len(graph.edges)},
-            top_diagnostics=graph.diagnostics[:5]
-        )
+        await asyncio.to_thread(storage.save_graph, doc_id, graph)
+        return graph
     except Exception as e:
-        import traceback
         error_detail = f"Error during analysis: {str(e)}\n{traceback.format_exc()}"
         print(error_detail)
         raise HTTPException(status_code=500, detail=error_detail)
 
+@router.post("/analyze", response_model=AnalysisSummary)
+async def analyze_doc(request: AnalyzeRequest, background_tasks: BackgroundTasks):
+    doc = storage.get_document(request.docId)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    graph = await _run_analysis(request.docId, doc.text, request.options)
+    
+    return AnalysisSummary(
+        docId=request.docId,
+        graph_summary={"nodes": len(graph.nodes), "edges": len(graph.edges)},
+        top_diagnostics=graph.diagnostics[:5]
+    )
+
+@router.post("/analyze_text", response_model=TextAnalysisResponse)
+async def analyze_text(request: AnalyzeTextRequest):
+    """
+    Creates a document, analyzes it and returns the full graph in one round trip.
+    Equivalent to POST /docs + POST /analyze + GET /docs/{id}/graph.
+    """
+    doc_id = str(uuid.uuid4())
+    storage.save_document(doc_id, request.text, request.lang)
+    
+    graph = await _run_analysis(doc_id, request.text, request.options)
+    
+    return TextAnalysisResponse(docId=doc_id, **dict(graph))
+
 @router.get("/docs/{doc_id}/graph", response_model=MeaningGraph)
-async def get_graph(doc_id: str):
+async def get_graph(doc_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """
+    The document's graph, with an ETag from the graph's last save. A request whose
+    If-None-Match carries the current ETag gets 304 without the graph being loaded.
+    """
+    # Read the version before the graph: if a save lands in between, the ETag is the
+    # older one and the client's next request fetches the newer graph
+    version = storage.get_graph_version(doc_id)
+    etag = f'"{version}"' if version else None
+    if etag and if_none_match and (
+        if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+    
     graph = storage.get_graph(doc_id)
     if not graph:
         raise HTTPException(status_code=404, detail="Graph not found. Run /analyze first.")
+    if etag:
+        response.headers["ETag"] = etag
     return graph
 
+@router.get("/docs/{doc_id}/graph/stream")
+async def stream_graph(doc_id: str):
+    """
+    Streams a graph as newline-delimited JSON: nodes, then edges, then the remaining
+    sections, one {"section": ..., "item": ...} object per line.
+    """
+    graph = storage.get_graph(doc_id)
+    if not graph:
+        raise HTTPException(status_code=404, detail="Graph not found. Run /analyze first.")
+    
+    def lines():
+        for section in MeaningGraph.model_fields:
+            for item in getattr(graph, section):
+                yield f'{{"section":"{section}","item":{item.model_dump_json()}}}\n'
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/docs/{doc_id}/logic")
 async def get_logic(doc_id: str):
     graph = storage.get_graph(doc_id)
     if not graph:
         raise HTTPException(status_code=404, detail="Graph not found. Run /analyze first.")
     
-    graph_data = graph.dict()
-    # Reconstruct objects
-    from app.models import MeaningGraph, Assertion
-    assertions = [Assertion(**a) for a in graph_data.get('assertions', [])]
-    # We need a proper MeaningGraph object for LogicEngine, but it only uses assertions for now.
-    # But let's be safe and reconstruct minimal graph.
-    graph = MeaningGraph(
-        nodes=[], 
-        edges=[], 
-        assertions=assertions,
-        ambiguity_sets=[],
-        context_frames=[],
-        diagnostics=[],
-        provenance=[]
-    )
-    
-    from app.logic import LogicEngine
+    # storage already returns a MeaningGraph; LogicEngine reads its assertions directly
     engine = LogicEngine(graph)
     
     return {
@@ -132,7 +192,7 @@ async def get_logic(doc_id: str):
 # --- Dashboard Endpoints ---
 
 from app.agent.session import get_session
-from app.agent.interceptor import Interceptor
+from app.agent.interceptor import get_interceptor
 
 class ChatMessage(BaseModel):
     message: str
@@ -153,7 +213,7 @@ async def chat_message(msg: ChatMessage):
     Returns the system warning (if any) and a simulated agent response.
     """
     session = get_session()
-    interceptor = Interceptor()
+    interceptor = get_interceptor()
     
     # Run Interceptor
     warning = interceptor.check_and_inject(msg.message, session)
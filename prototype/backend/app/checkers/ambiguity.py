@@ -1,5 +1,16 @@
-from typing import List, Dict, Any
-from app.models import MeaningGraph, Node, Edge, NodeType, Diagnostic, DiagnosticKind, Severity, Provenance
+from typing import List, Dict, Any, Optional, Set, Tuple
+from app.models import MeaningGraph, Node, Edge, NodeType, EdgeRole, Diagnostic, DiagnosticKind, Severity, Provenance
+
+class AmbiguityIndex:
+    """
+    Running state for incremental ambiguity checks over a growing session graph.
+    A vague pronoun can be cleared by a reference edge added in a later turn, so
+    its diagnostic is kept with the node ID and filtered when results are read.
+    """
+    def __init__(self):
+        self.referenced: Set[str] = set()
+        # (node ID of a vague pronoun or None, diagnostic), in node order
+        self.candidates: List[Tuple[Optional[str], Diagnostic]] = []
 
 class AmbiguityChecker:
     """
@@ -7,44 +18,50 @@ class AmbiguityChecker:
     MVP: Detects vague pronouns and generic nouns.
     """
     
-    VAGUE_PRONOUNS = {"it", "this", "that", "these", "those", "they"}
-    GENERIC_NOUNS = {"thing", "stuff", "item", "object", "file", "code", "function", "class", "data"}
+    VAGUE_PRONOUNS = frozenset({"it", "this", "that", "these", "those", "they"})
+    GENERIC_NOUNS = frozenset({"thing", "stuff", "item", "object", "file", "code", "function", "class", "data"})
+    REFERENCE_ROLES = frozenset({EdgeRole.REFERS_TO, EdgeRole.SAME_AS})
 
     def check(self, graph: MeaningGraph) -> List[Diagnostic]:
-        diagnostics = []
+        index = AmbiguityIndex()
+        return self.check_incremental(graph, index)
+
+    def check_incremental(self, new_graph: MeaningGraph, index: AmbiguityIndex) -> List[Diagnostic]:
+        """
+        Adds the nodes and edges of `new_graph` (this turn's slice of the session
+        graph) to `index` and returns the diagnostics for everything indexed so far.
+        Equivalent to check() on the full graph, without rescanning old nodes.
+        """
+        # Nodes that already point at a referent ("Refers_to" or "SameAs" edge)
+        index.referenced.update(e.source for e in new_graph.edges if e.role in self.REFERENCE_ROLES)
         
-        for node in graph.nodes:
+        for node in new_graph.nodes:
             if node.type == NodeType.ENTITY:
+                label_lc = node.label_norm
+                
                 # Check for Vague Pronouns
-                if node.label.lower() in self.VAGUE_PRONOUNS:
-                    # Check if it has a "Refers_to" or "SameAs" edge
-                    has_reference = any(
-                        e.source == node.id and e.role in ("Refers_to", "SameAs") 
-                        for e in graph.edges
-                    )
-                    
-                    if not has_reference:
-                        diagnostics.append(self._create_diagnostic(
-                            node, 
-                            f"Ambiguous pronoun '{node.label}'. What does '{node.label}' refer to?",
-                            Severity.WARNING
-                        ))
+                if label_lc in self.VAGUE_PRONOUNS:
+                    index.candidates.append((node.id, self._create_diagnostic(
+                        node, 
+                        f"Ambiguous pronoun '{node.label}'. What does '{node.label}' refer to?",
+                        Severity.WARNING
+                    )))
 
                 # Check for Generic Nouns
                 # e.g. "the file" is vague if we don't know WHICH file.
                 # Heuristic: If label is just a generic noun with no modifiers or specific properties.
-                elif node.label.lower() in self.GENERIC_NOUNS:
-                     # Check if it has specific properties or edges that clarify it
-                    is_specific = False
+                elif label_lc in self.GENERIC_NOUNS:
                     # (For MVP, we'll be strict: if it's just "file", it's vague)
-                    
-                    diagnostics.append(self._create_diagnostic(
+                    index.candidates.append((None, self._create_diagnostic(
                         node,
                         f"Vague term '{node.label}'. Which specific {node.label} do you mean?",
                         Severity.INFO
-                    ))
+                    )))
 
-        return diagnostics
+        return [
+            diagnostic for node_id, diagnostic in index.candidates
+            if node_id is None or node_id not in index.referenced
+        ]
 
     def _create_diagnostic(self, node: Node, message: str, severity: Severity) -> Diagnostic:
         return Diagnostic(
@@ -1,5 +1,6 @@
-from typing import List, Dict
-from app.models import MeaningGraph, Assertion, Node
+from typing import List, Dict, Optional, Tuple
+from itertools import combinations
+from app.models import MeaningGraph, Assertion, Node, EdgeRole
 
 class ContinuityError:
     def __init__(self, subject: str, property_name: str, val1: str, val2: str, span1: Dict, span2: Dict):
@@ -22,41 +23,127 @@ class ContinuityError:
             }
         }
 
+class ContinuityIndex:
+    """
+    Running state for incremental continuity checks over a growing session graph.
+    Holds the SameAs links, label/id lookups for the nodes seen so far, and the
+    distinct values seen for each (subject, predicate), in first-seen order.
+    """
+    def __init__(self):
+        # Raw SameAs links (last edge per source wins), and the same links with
+        # chains (A->B->C) compressed so repeat lookups are a single hop
+        self.same_as: Dict[str, str] = {}
+        self.canonical_map: Dict[str, str] = {}
+        self.label_to_id: Dict[str, str] = {}
+        self.id_to_label: Dict[str, str] = {}
+        self.seen_values: Dict[Tuple[str, str], Dict[Optional[str], None]] = {}
+
+    def add_nodes(self, nodes: List[Node]):
+        # First node wins for both lookups, matching a front-to-back scan of graph.nodes
+        for node in nodes:
+            self.label_to_id.setdefault(node.label, node.id)
+            self.id_to_label.setdefault(node.id, node.label)
+
+    def add_same_as(self, source: str, target: str):
+        previous = self.same_as.get(source)
+        self.same_as[source] = target
+        if previous is None:
+            self.canonical_map[source] = target
+        elif previous != target:
+            # Compressed paths may skip over the relinked node; start again from the raw links
+            self.canonical_map = dict(self.same_as)
+
+    def find(self, node_id: str) -> str:
+        """Follow SameAs links to the end of the chain (stopping at cycles), compressing the path."""
+        path = []
+        seen = {node_id}
+        current = node_id
+        while current in self.canonical_map:
+            nxt = self.canonical_map[current]
+            if nxt in seen:
+                break
+            path.append(current)
+            seen.add(nxt)
+            current = nxt
+        for visited in path:
+            self.canonical_map[visited] = current
+        return current
+
 class ContinuityChecker:
+    def _resolve_subject(self, index: ContinuityIndex, subj_id_or_label: str) -> str:
+        """Resolve a subject to its canonical label via SameAs edges."""
+        # Try to find node by label if passed as label (assertions store labels currently?)
+        # The Assertion model stores 'subject' as string label usually.
+        # But we need to link it back to the Node ID to check edges.
+        
+        # Let's assume for this prototype that we can find the node by label
+        # Or better, let's look at how assertions are created. 
+        # They seem to use labels. This is a weakness in the current AssertionExtractor.
+        # It should probably use IDs.
+        
+        # Workaround: Find node with this label
+        # (This is ambiguous if multiple "buildings" exist, but acceptable for prototype)
+        node_id = index.label_to_id.get(subj_id_or_label)
+        if node_id is not None:
+            # Check if this node maps to another
+            if node_id in index.canonical_map:
+                target_id = index.find(node_id)
+                if target_id in index.id_to_label:
+                    return index.id_to_label[target_id]
+        return subj_id_or_label
+
+    def check_incremental(self, graph: MeaningGraph, new_graph: MeaningGraph, index: ContinuityIndex) -> List[ContinuityError]:
+        """
+        Checks only the assertions in `new_graph` (this turn's slice of `graph`)
+        against the values already recorded in `index`, then records them.
+        
+        Not fully equivalent to check() on the full graph:
+        - Each assertion's subject is resolved once, when it arrives. A SameAs edge
+          added in a later turn does not re-group earlier assertions, so a conflict
+          between them and assertions about the merged entity can be missed.
+        - Errors carry no spans (span1/span2 are None; check() has no spans
+          either) and come out in arrival order, not grouped by subject.
+        """
+        errors = []
+        
+        index.add_nodes(new_graph.nodes)
+        for edge in new_graph.edges:
+            if edge.role is EdgeRole.SAME_AS:
+                index.add_same_as(edge.source, edge.target)
+        
+        for assertion in new_graph.assertions:
+            subj = self._resolve_subject(index, assertion.subject)
+            key = (subj, assertion.predicate)
+            seen = index.seen_values.setdefault(key, {})
+            
+            # A value already seen has already been reported against every other value
+            if assertion.object in seen:
+                continue
+            for prev_val in seen:
+                errors.append(ContinuityError(
+                    subject=subj,
+                    property_name=assertion.predicate,
+                    val1=prev_val,
+                    val2=assertion.object,
+                    span1=None,
+                    span2=None
+                ))
+            seen[assertion.object] = None
+        
+        return errors
+
     def check(self, graph: MeaningGraph) -> List[ContinuityError]:
         errors = []
         
         # 1. Build Canonical Entity Map from SameAs edges
         # Map: entity_id -> canonical_entity_id
-        canonical_map = {}
+        # The label/id lookups are built once here rather than scanning nodes per assertion
+        index = ContinuityIndex()
+        index.add_nodes(graph.nodes)
         for edge in graph.edges:
-            if edge.role == "SameAs":
-                # If A -> B (SameAs), then A maps to B
-                # We should ideally handle chains (A->B->C), but 1-hop is fine for prototype
-                canonical_map[edge.source] = edge.target
-
-        # Helper to resolve subject to canonical ID
-        def resolve_subject(subj_id_or_label):
-            # Try to find node by label if passed as label (assertions store labels currently?)
-            # The Assertion model stores 'subject' as string label usually.
-            # But we need to link it back to the Node ID to check edges.
-            
-            # Let's assume for this prototype that we can find the node by label
-            # Or better, let's look at how assertions are created. 
-            # They seem to use labels. This is a weakness in the current AssertionExtractor.
-            # It should probably use IDs.
-            
-            # Workaround: Find node with this label
-            # (This is ambiguous if multiple "buildings" exist, but acceptable for prototype)
-            node = next((n for n in graph.nodes if n.label == subj_id_or_label), None)
-            if node:
-                # Check if this node maps to another
-                if node.id in canonical_map:
-                    target_id = canonical_map[node.id]
-                    target_node = next((n for n in graph.nodes if n.id == target_id), None)
-                    if target_node:
-                        return target_node.label
-            return subj_id_or_label
+            if edge.role is EdgeRole.SAME_AS:
+                # If A -> B (SameAs), then A maps to B; chains (A->B->C) resolve to C
+                index.add_same_as(edge.source, edge.target)
 
         # 2. Group assertions by Canonical Subject -> Predicate
         # Structure: { "Gregor": { "eye_color": [ {val: "blue", span: ...}, {val: "brown", span: ...} ] } }
@@ -64,7 +151,7 @@ class ContinuityChecker:
 
         for assertion in graph.assertions:
             raw_subj = assertion.subject
-            subj = resolve_subject(raw_subj) # Resolve to canonical
+            subj = self._resolve_subject(index, raw_subj) # Resolve to canonical
             
             pred = assertion.predicate
             obj = assertion.object
@@ -83,20 +170,20 @@ class ContinuityChecker:
         # 2. Detect Conflicts
         for subj, props in entity_properties.items():
             for pred, values in props.items():
-                if len(values) > 1:
-                    # Check if values are different
-                    first_val = values[0]["value"]
-                    for i in range(1, len(values)):
-                        curr_val = values[i]["value"]
-                        if curr_val != first_val:
-                            # Found a conflict!
-                            errors.append(ContinuityError(
-                                subject=subj,
-                                property_name=pred,
-                                val1=first_val,
-                                val2=curr_val,
-                                span1=values[0]["span"],
-                                span2=values[i]["span"]
-                            ))
+                # Collapse repeats of the same value (first occurrence kept)
+                distinct: Dict[Optional[str], Dict] = {}
+                for v in values:
+                    distinct.setdefault(v["value"], v)
+                
+                # One conflict per pair of distinct values
+                for (val1, first), (val2, second) in combinations(distinct.items(), 2):
+                    errors.append(ContinuityError(
+                        subject=subj,
+                        property_name=pred,
+                        val1=val1,
+                        val2=val2,
+                        span1=first["span"],
+                        span2=second["span"]
+                    ))
                             
         return errors
@@ -13,8 +13,21 @@ Example:
   Both relate to "application" → CONTRADICTION
 """
 
-from typing import List, Set, Tuple
-from app.models import MeaningGraph, Diagnostic, DiagnosticKind
+from typing import Dict, List, Optional, Set, Tuple
+from app.models import MeaningGraph, Diagnostic, DiagnosticKind, NodeType
+from app.checkers.labels import tokenize_labels
+
+# Node types whose labels can carry contradictory adjectives
+_ENTITY_OR_EVENT = frozenset({NodeType.ENTITY, NodeType.EVENT})
+
+
+class CrossMessageIndex:
+    """
+    Running state for incremental cross-message checks over a growing session graph:
+    token -> list of (entity_id, lowercased label) for the entities seen so far.
+    """
+    def __init__(self):
+        self.token_to_entities: Dict[str, List[Tuple[str, str]]] = {}
 
 
 class CrossMessageContradictionChecker:
@@ -52,8 +65,17 @@ class CrossMessageContradictionChecker:
             frozenset(['reliable', 'unreliable']),
             frozenset(['stable', 'unstable']),
         }
+        
+        # word -> its antonyms, so check() only looks at tokens that have one
+        self._antonym_index: Dict[str, List[str]] = {}
+        for pair in self.antonym_pairs:
+            if len(pair) != 2:
+                continue
+            a, b = tuple(pair)
+            self._antonym_index.setdefault(a, []).append(b)
+            self._antonym_index.setdefault(b, []).append(a)
     
-    def check(self, graph: MeaningGraph) -> List[Diagnostic]:
+    def check(self, graph: MeaningGraph, label_tokens: Optional[Dict[str, List[str]]] = None) -> List[Diagnostic]:
         """
         Check for contradictions across messages.
         
@@ -62,59 +84,65 @@ class CrossMessageContradictionChecker:
         2. Tokenize labels to find adjectives within them
         3. Find antonym pairs across all tokens
         4. Flag contradictions
-        """
-        import re
         
+        `label_tokens` (from tokenize_labels) can be passed in when other checkers
+        have already tokenized this graph.
+        """
+        return self.check_incremental(graph, CrossMessageIndex(), label_tokens)
+    
+    def check_incremental(self, new_graph: MeaningGraph, index: CrossMessageIndex,
+                          label_tokens: Optional[Dict[str, List[str]]] = None) -> List[Diagnostic]:
+        """
+        Adds the entities of `new_graph` (this turn's slice of the session graph)
+        to `index` and returns the contradictions among everything indexed so far.
+        Equivalent to check() on the full graph, without re-tokenizing old labels.
+        """
         diagnostics = []
         
+        if label_tokens is None:
+            label_tokens = tokenize_labels(new_graph)
+        
         # Get all entity labels
         entity_labels = {}
-        for node in graph.nodes:
-            if node.type in ["Entity", "Event"]:
-                entity_labels[node.id] = node.label.lower()
-        
-        print(f"[CROSS-MESSAGE DEBUG] Found {len(entity_labels)} entities")
-        print(f"[CROSS-MESSAGE DEBUG] Entity labels: {list(entity_labels.values())}")
+        for node in new_graph.nodes:
+            if node.type in _ENTITY_OR_EVENT:
+                entity_labels[node.id] = node.label
         
         # Tokenize all labels and track which tokens come from which entities
         # token -> list of (entity_id, full_label)
-        token_to_entities = {}
+        token_to_entities = index.token_to_entities
         
         for entity_id, label in entity_labels.items():
             # Split on whitespace and hyphens
-            tokens = set(w.lower() for w in re.split(r'[\s\-]+', label) if w and len(w) > 1)
+            tokens = set(w for w in label_tokens[label] if len(w) > 1)
             
+            lowered = label.lower()
             for token in tokens:
                 if token not in token_to_entities:
                     token_to_entities[token] = []
-                token_to_entities[token].append((entity_id, label))
-        
-        print(f"[CROSS-MESSAGE DEBUG] Tokens found: {list(token_to_entities.keys())}")
+                token_to_entities[token].append((entity_id, lowered))
         
-        # Check for antonym pairs in the tokens
-        all_tokens = set(token_to_entities.keys())
+        # Check for antonym pairs in the tokens, starting only from tokens that have antonyms
+        emitted: Set[frozenset] = set()
         
-        for antonym_set in self.antonym_pairs:
-            antonym_list = list(antonym_set)
-            if len(antonym_list) != 2:
-                continue
-            
-            word1, word2 = antonym_list
-            
-            # Check if both antonyms appear as tokens
-            if word1 in all_tokens and word2 in all_tokens:
-                print(f"[CROSS-MESSAGE DEBUG] Found antonym pair: {word1}/{word2}")
+        for word1 in token_to_entities.keys() & self._antonym_index.keys():
+            for word2 in self._antonym_index[word1]:
+                # Both antonyms must appear as tokens; each pair is reported once
+                pair = frozenset((word1, word2))
+                if word2 not in token_to_entities or pair in emitted:
+                    continue
+                emitted.add(pair)
                 
                 # Get entities containing these tokens
                 entities1 = token_to_entities[word1]
                 entities2 = token_to_entities[word2]
                 
                 # If they come from different entities, it's a contradiction
-                # (same entity would be caught by oxymoron checker)
+                # (an entity holding both words is the oxymoron checker's job)
                 entity_ids1 = {eid for eid, _ in entities1}
                 entity_ids2 = {eid for eid, _ in entities2}
                 
-                if entity_ids1 != entity_ids2:  # Different entities
+                if entity_ids1.isdisjoint(entity_ids2):  # Different entities
                     # Create diagnostic
                     labels1 = {lbl for _, lbl in entities1}
                     labels2 = {lbl for _, lbl in entities2}
@@ -122,8 +150,6 @@ class CrossMessageContradictionChecker:
                     all_labels = labels1 | labels2
                     label_list = ', '.join(f"'{l}'" for l in all_labels)
                     
-                    print(f"[CROSS-MESSAGE DEBUG] Creating diagnostic for {word1}/{word2}")
-                    
                     # Use first entity as anchor
                     anchor_entity = list(entity_ids1)[0] if entity_ids1 else list(entity_ids2)[0]
                     
@@ -136,5 +162,4 @@ class CrossMessageContradictionChecker:
                         span_end=0
                     ))
         
-        print(f"[CROSS-MESSAGE DEBUG] Total diagnostics: {len(diagnostics)}")
         return diagnostics
@@ -10,22 +10,23 @@ class DiscourseChecker:
     - SEQUENCE: "then", "after", "before"
     """
     
+    MARKER_ROLES = {
+        "because": EdgeRole.CAUSE, "since": EdgeRole.CAUSE, "so": EdgeRole.CAUSE, "therefore": EdgeRole.CAUSE,
+        "but": EdgeRole.CONTRAST, "however": EdgeRole.CONTRAST, "although": EdgeRole.CONTRAST, "though": EdgeRole.CONTRAST,
+        "then": EdgeRole.SEQUENCE, "after": EdgeRole.SEQUENCE, "before": EdgeRole.SEQUENCE,
+    }
+    
     def check(self, graph: MeaningGraph, doc: Any) -> List[Edge]:
         new_edges = []
         
+        # Index Event nodes by the token they came from, built once per check
+        event_index = self._build_event_index(graph)
+        
         # We need to look at the dependency parse (doc) to find markers connecting verbs
         # Iterate over tokens in the doc
         for token in doc:
             # Check for markers
-            marker = token.text.lower()
-            role = None
-            
-            if marker in ("because", "since", "so", "therefore"):
-                role = EdgeRole.CAUSE
-            elif marker in ("but", "however", "although", "though"):
-                role = EdgeRole.CONTRAST
-            elif marker in ("then", "after", "before"):
-                role = EdgeRole.SEQUENCE
+            role = self.MARKER_ROLES.get(token.text.lower())
                 
             if role:
                 # If we found a marker, we need to find the two events it connects.
@@ -46,8 +47,8 @@ class DiscourseChecker:
                     effect_event_token = head.head # "fell"
                     
                     # Find corresponding nodes
-                    cause_node = self._find_event_node(graph, cause_event_token.i)
-                    effect_node = self._find_event_node(graph, effect_event_token.i)
+                    cause_node = self._find_event_node(event_index, cause_event_token.i)
+                    effect_node = self._find_event_node(event_index, effect_event_token.i)
                     
                     if cause_node and effect_node:
                         # For "because", the sub-clause is the CAUSE
@@ -81,8 +82,8 @@ class DiscourseChecker:
                     event2_token = next((c for c in head.children if c.dep_ == "conj"), None)
                     
                     if event2_token:
-                        node1 = self._find_event_node(graph, event1_token.i)
-                        node2 = self._find_event_node(graph, event2_token.i)
+                        node1 = self._find_event_node(event_index, event1_token.i)
+                        node2 = self._find_event_node(event_index, event2_token.i)
                         
                         if node1 and node2:
                             new_edges.append(Edge(
@@ -94,12 +95,16 @@ class DiscourseChecker:
 
         return new_edges
 
-    def _find_event_node(self, graph: MeaningGraph, token_index: int) -> Node:
-        """Find the Event node corresponding to a token index."""
-        # Try both evt_N and tok_N patterns since pipeline creates both
-        target_ids = [f"evt_{token_index}", f"tok_{token_index}"]
-        
+    def _build_event_index(self, graph: MeaningGraph) -> Dict[str, Node]:
+        """Map "N" -> the first Event node with id evt_N or tok_N (pipeline creates both)."""
+        event_index: Dict[str, Node] = {}
         for node in graph.nodes:
-            if node.type == NodeType.EVENT and node.id in target_ids:
-                return node
-        return None
+            if node.type == NodeType.EVENT:
+                prefix, _, token_index = node.id.partition("_")
+                if prefix in ("evt", "tok"):
+                    event_index.setdefault(token_index, node)
+        return event_index
+
+    def _find_event_node(self, event_index: Dict[str, Node], token_index: int) -> Node:
+        """Find the Event node corresponding to a token index."""
+        return event_index.get(str(token_index))
@@ -0,0 +1,28 @@
+"""
+Shared label tokenization for the checkers.
+
+Labels are case-folded and split on whitespace and hyphens, so "Tall-Short"
+and "tall short" give the same tokens. When several checkers run over the
+same graph, tokenize once with tokenize_labels() and pass the result to
+each checker's check().
+"""
+
+import re
+from typing import Dict, List
+from app.models import MeaningGraph
+
+TOKEN_SPLIT = re.compile(r'[\s\-]+')
+
+
+def tokenize(label: str) -> List[str]:
+    """Case-folded tokens of a label, in label order."""
+    return [w for w in TOKEN_SPLIT.split(label.casefold()) if w]
+
+
+def tokenize_labels(graph: MeaningGraph) -> Dict[str, List[str]]:
+    """Tokens for every distinct node label in the graph (label -> tokens)."""
+    tokens: Dict[str, List[str]] = {}
+    for node in graph.nodes:
+        if node.label not in tokens:
+            tokens[node.label] = [w for w in TOKEN_SPLIT.split(node.label_norm) if w]
+    return tokens
@@ -1,5 +1,6 @@
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from app.models import MeaningGraph, Diagnostic, DiagnosticKind, Severity, Provenance
+from app.checkers.labels import tokenize_labels
 
 class OxymoronChecker:
     """
@@ -27,24 +28,43 @@ class OxymoronChecker:
             ({"young", "old"}, "age"),
             ({"new", "old"}, "age"),
         ]
+        
+        # Inverted index: word -> positions in self.antonyms of the pairs it belongs to,
+        # so labels without any antonym word cost a single set intersection
+        self._index: Dict[str, List[int]] = {}
+        for i, (pair, category) in enumerate(self.antonyms):
+            for word in pair:
+                self._index.setdefault(word, []).append(i)
 
-    def check(self, graph: MeaningGraph) -> List[Diagnostic]:
+    def check(self, graph: MeaningGraph, label_tokens: Optional[Dict[str, List[str]]] = None) -> List[Diagnostic]:
         diagnostics = []
         
+        # Tokenized labels - split on both spaces AND hyphens
+        # This allows detection of "tall-short" as well as "tall short"
+        if label_tokens is None:
+            label_tokens = tokenize_labels(graph)
+        
         for node in graph.nodes:
-            # Tokenize label - split on both spaces AND hyphens
-            # This allows detection of "tall-short" as well as "tall short"
-            import re
-            words = set(w.lower() for w in re.split(r'[\s\-]+', node.label) if w)
+            tokens = label_tokens[node.label]
+            words = set(tokens)
+            
+            candidates = words & self._index.keys()
+            if len(candidates) < 2:
+                continue
             
-            for pair, category in self.antonyms:
+            # Pairs touched by the label's words, in the order of self.antonyms
+            pair_ids = sorted({i for w in candidates for i in self._index[w]})
+            for i in pair_ids:
+                pair, category = self.antonyms[i]
                 # Check if both words in the pair exist in the label
                 if pair.issubset(words):
-                    # Found an oxymoron!
+                    # Found an oxymoron! Report the terms in the order they appear in the label
+                    terms = [w for w in dict.fromkeys(tokens) if w in pair]
                     diagnostics.append(Diagnostic(
                         kind=DiagnosticKind.CONTRADICTION,
-                        message=f"The phrase '{node.label}' contains contradictory terms ({' and '.join(pair)}).",
+                        message=f"The phrase '{node.label}' contains contradictory terms ({' and '.join(terms)}).",
                         severity=Severity.WARNING,
+                        terms=terms,
                         provenance=[Provenance(
                             engine_id="oxymoron-checker",
                             engine_version="1.0",
@@ -1,8 +1,19 @@
-from typing import List, Dict, Any
-import spacy
-from app.models import MeaningGraph, Edge, EdgeRole, Provenance, NodeType
+from typing import List, Dict, Any, Optional
+from app.models import MeaningGraph, Node, Edge, EdgeRole, Provenance, NodeType
+
+class CorefState:
+    """
+    Antecedent candidates carried between resolve() calls, so a session can
+    resolve each turn's pronouns without re-walking earlier turns.
+    """
+    def __init__(self):
+        self.last_noun: Optional[Node] = None    # any non-pronoun Noun/PropNoun entity
+        self.last_person: Optional[Node] = None  # ... that is also a spaCy PERSON entity
 
 class CoreferenceResolver:
+    GENDER_BITS = {"male": 1, "female": 2, "thing": 4, "plural": 8}
+    GENDERED = GENDER_BITS["male"] | GENDER_BITS["female"]
+    
     def __init__(self):
         # Simple heuristic mapping for prototype
         self.pronouns = {
@@ -22,13 +33,35 @@ class CoreferenceResolver:
             "their": ["person", "thing", "plural"],
             "themselves": ["person", "thing", "plural"]
         }
+        
+        # The tag lists packed into one bitmask per pronoun for the resolve() hot path
+        self._pronoun_gender: Dict[str, int] = {
+            pronoun: sum(bit for tag, bit in self.GENDER_BITS.items() if tag in tags)
+            for pronoun, tags in self.pronouns.items()
+        }
 
-    def resolve(self, doc, graph: MeaningGraph) -> MeaningGraph:
+    def resolve(self, doc: Optional[Any], graph: MeaningGraph, new_nodes: Optional[List[Node]] = None,
+                state: Optional[CorefState] = None) -> MeaningGraph:
         """
         Adds SAME_AS edges between pronouns and their likely antecedents.
+        Works purely on the graph: the "pos"/"label" node properties the pipeline
+        already extracted are all it needs, so `doc` is unused (pass None) and no
+        spaCy components have to run for coreference.
+        If `new_nodes` is given, only pronouns among those nodes are resolved
+        (antecedents are still searched across the whole graph); pronouns from
+        earlier turns already have their edges.
+        If `state` is given as well, it must hold the candidates left by the previous
+        calls for this graph, and `new_nodes` must be the nodes appended since; then
+        only `new_nodes` are walked.
         """
-        # Get all Entity nodes
-        entities = [n for n in graph.nodes if n.type == NodeType.ENTITY]
+        if state is not None and new_nodes is not None:
+            entities = [n for n in new_nodes if n.type == NodeType.ENTITY]
+            new_node_refs = None
+        else:
+            # Get all Entity nodes
+            entities = [n for n in graph.nodes if n.type == NodeType.ENTITY]
+            new_node_refs = {id(n) for n in new_nodes} if new_nodes is not None else None
+            state = CorefState()
         
         # Sort by position in text to allow lookback
         # We need to parse the ID or use span info. 
@@ -41,62 +74,71 @@ class CoreferenceResolver:
         # We should trust the list order provided by the caller (SessionManager appends).
         pass
         
+        graph.edges.extend(self._sweep(entities, state, new_node_refs))
+        return graph
+
+    def resolve_batch(self, graphs: List[MeaningGraph]) -> List[MeaningGraph]:
+        """
+        Resolves a sequence of turn graphs in one forward pass. Pronouns may refer
+        back to entities in earlier turns; each SameAs edge is added to the graph
+        of the turn its pronoun came from.
+        """
+        state = CorefState()
+        for graph in graphs:
+            entities = [n for n in graph.nodes if n.type == NodeType.ENTITY]
+            graph.edges.extend(self._sweep(entities, state))
+        return graphs
+
+    def _sweep(self, entities: List[Node], state: CorefState, new_node_refs: Optional[set] = None) -> List[Edge]:
         new_edges = []
+        pronoun_gender = self._pronoun_gender
+        
+        # Single forward pass: remember the nearest preceding antecedent of each kind
+        # instead of scanning back over all earlier entities for every pronoun.
+        last_noun = state.last_noun
+        last_person = state.last_person
         
-        for i, node in enumerate(entities):
-            text = node.label.lower()
+        # Every edge from this pass has the same provenance, so they share one instance
+        provenance = None
+        
+        for node in entities:
+            mask = pronoun_gender.get(node.label_norm)
             
-            if text in self.pronouns:
-                # Look backwards for a candidate
-                candidate = None
+            if mask is not None:
+                if new_node_refs is not None and id(node) not in new_node_refs:
+                    continue
                 
-                # Simple lookback: Find nearest preceding entity that is NOT a pronoun
-                # (or is a pronoun that has been resolved? - keep it simple for now)
-                for j in range(i - 1, -1, -1):
-                    prev_node = entities[j]
-                    prev_text = prev_node.label.lower()
-                    
-                    # Skip if previous node is also a pronoun
-                    if prev_text in self.pronouns:
-                        continue
-                        
-                    # Check if candidate is a valid target for the pronoun
-                    # For "he/him/his", we prefer PERSON entities.
-                    # We can check the entity type from properties if available.
-                    # The pipeline stores `ent.label_` in properties['label'] for entities.
-                    # For tokens mapped to entities, we might not have it.
-                    
-                    # UPDATE: Check POS tag. Pronouns should refer to Nouns/PropNouns.
-                    # Avoid linking to Adjectives (e.g. "The building is tall. It..." -> "It" shouldn't link to "tall")
-                    pos = prev_node.properties.get("pos")
-                    if pos and pos not in ("NOUN", "PROPN"):
-                        continue
-                    
-                    pronoun_gender = self.pronouns[text]
-                    
-                    # Heuristic: If pronoun is male/female, prefer PERSON
-                    if "male" in pronoun_gender or "female" in pronoun_gender:
-                        # Check if node has 'PERSON' label in properties
-                        # Note: pipeline.py stores spacy ent label in properties['label']
-                        ent_type = prev_node.properties.get("label", "")
-                        if ent_type != "PERSON":
-                            # If it's not explicitly a PERSON, maybe we skip it?
-                            # "dreams" is not a PERSON.
-                            # But "Gregor Samsa" is.
-                            continue
-                            
-                    candidate = prev_node
-                    break
+                # Heuristic: If pronoun is male/female, only link to PERSON entities
+                # ("dreams" is not a PERSON, "Gregor Samsa" is).
+                if mask & self.GENDERED:
+                    candidate = last_person
+                else:
+                    candidate = last_noun
                 
                 if candidate:
+                    if provenance is None:
+                        provenance = Provenance(engine_id="heuristic-coref", engine_version="0.1.0")
                     # Create SAME_AS edge
                     edge = Edge(
                         source=node.id,
                         target=candidate.id,
-                        role="SameAs", # Custom role for now, or add to Enum
-                        provenance=[Provenance(engine_id="heuristic-coref", engine_version="0.1.0")]
+                        role=EdgeRole.SAME_AS,
+                        provenance=[provenance]
                     )
                     new_edges.append(edge)
-                    
-        graph.edges.extend(new_edges)
-        return graph
+                continue
+            
+            # Pronouns should refer to Nouns/PropNouns. Avoid linking to Adjectives
+            # (e.g. "The building is tall. It..." -> "It" shouldn't link to "tall")
+            pos = node.properties.get("pos")
+            if pos and pos not in ("NOUN", "PROPN"):
+                continue
+            
+            last_noun = node
+            # Note: pipeline.py stores spacy ent label in properties['label']
+            if node.properties.get("label", "") == "PERSON":
+                last_person = node
+        
+        state.last_noun = last_noun
+        state.last_person = last_person
+        return new_edges
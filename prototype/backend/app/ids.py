@@ -0,0 +1,30 @@
+"""
+Cheap random IDs for identifiers inside a meaning graph (context frames, ambiguity sets).
+
+uuid.uuid4() does an os.urandom() syscall per call; here random bytes are read
+4 KiB at a time and sliced. These IDs are stored in the graph JSON and returned
+by the API, but they only need to be unique within one graph: 4 bytes is too
+short to be unique across graphs, and nothing here is fit for security-sensitive
+use (tokens, secrets). Document and session IDs stay uuid4.
+"""
+
+import os
+import threading
+
+_POOL_SIZE = 4096
+
+_pool = b""
+_pos = 0
+_lock = threading.Lock()
+
+
+def fast_id(nbytes: int = 4) -> str:
+    """Return `nbytes` random bytes as hex (4 bytes -> 8 chars, like uuid4().hex[:8])."""
+    global _pool, _pos
+    with _lock:
+        if _pos + nbytes > len(_pool):
+            _pool = os.urandom(_POOL_SIZE)
+            _pos = 0
+        chunk = _pool[_pos:_pos + nbytes]
+        _pos += nbytes
+    return chunk.hex()
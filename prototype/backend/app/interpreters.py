@@ -1,69 +1,81 @@
-from abc import ABC, abstractmethod
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any, Protocol, Sequence, Tuple
 from app.models import MeaningGraph, Diagnostic, DiagnosticKind, Severity, ProcessingMode
+from app.plugins import registry
 
-class BaseInterpreter(ABC):
-    @abstractmethod
+_EMPTY: dict = {}
+
+class BaseInterpreter(Protocol):
+    """Anything with an interpret(graph) method; checked structurally, no base class needed."""
     def interpret(self, graph: MeaningGraph) -> MeaningGraph:
-        pass
+        ...
 
-class MapInterpreter(BaseInterpreter):
+class MapInterpreter:
     """
     Default interpreter. Returns the graph as mapped, with basic diagnostics.
     """
     def interpret(self, graph: MeaningGraph) -> MeaningGraph:
         # Map mode: Contradictions are annotations only.
         # Ensure no diagnostics are marked as ERROR unless system failure.
+        contradiction, warning = DiagnosticKind.CONTRADICTION, Severity.WARNING
         for diag in graph.diagnostics:
-            if diag.kind == DiagnosticKind.CONTRADICTION:
-                diag.severity = Severity.WARNING
+            if diag.kind == contradiction and diag.severity != warning:
+                diag.severity = warning
         return graph
 
-class FictionInterpreter(BaseInterpreter):
+class FictionInterpreter:
     """
     Downgrades world-model conflicts to narrative annotations.
     """
+    PREFIX = "[Narrative] "
+    
     def interpret(self, graph: MeaningGraph) -> MeaningGraph:
         # Downgrade specific diagnostics
+        # Only touch what still needs it, so interpreting a graph twice doesn't
+        # stack "[Narrative] " prefixes.
+        contradiction, info = DiagnosticKind.CONTRADICTION, Severity.INFO
         for diag in graph.diagnostics:
-            if diag.kind == DiagnosticKind.CONTRADICTION:
-                diag.severity = Severity.INFO
-                diag.message = f"[Narrative] {diag.message}"
+            if diag.kind != contradiction:
+                continue
+            if diag.severity != info:
+                diag.severity = info
+            if not diag.message.startswith(self.PREFIX):
+                diag.message = self.PREFIX + diag.message
         return graph
 
-class TruthInterpreter(BaseInterpreter):
+class TruthInterpreter:
     """
     Runs validation plugins and escalates diagnostics.
     """
-    def __init__(self, plugins: List[Any] = []):
-        self.plugins = plugins
+    def __init__(self, plugins: Optional[Sequence[Any]] = None):
+        self.plugins: Tuple[Any, ...] = tuple(plugins) if plugins else ()
 
     def interpret(self, graph: MeaningGraph) -> MeaningGraph:
         # Run plugins from registry
-        from app.plugins import registry
-        
         # For prototype, just run all registered plugins
         # In reality, we'd select based on config
-        for plugin in registry._plugins.values():
+        for plugin in registry.plugins():
             result = plugin.run(graph, context={"doc_id": "unknown"}) # Context needs doc_id
             
             # Merge results
-            if "diagnostics" in result:
-                graph.diagnostics.extend(result["diagnostics"])
+            graph.diagnostics.extend(result.get("diagnostics", ()))
             
-            if "graph_updates" in result:
-                updates = result["graph_updates"]
-                if "edges" in updates:
-                    graph.edges.extend(updates["edges"])
-                if "nodes" in updates:
-                    graph.nodes.extend(updates["nodes"])
+            updates = result.get("graph_updates", _EMPTY)
+            graph.edges.extend(updates.get("edges", ()))
+            graph.nodes.extend(updates.get("nodes", ()))
             
         return graph
 
+_INTERPRETER_CLASSES = {
+    ProcessingMode.FICTION: FictionInterpreter,
+    ProcessingMode.TRUTH: TruthInterpreter,
+}
+
+# Interpreters hold no per-request state, so one instance per mode is shared
+_interpreters: Dict[ProcessingMode, BaseInterpreter] = {}
+
 def get_interpreter(mode: ProcessingMode) -> BaseInterpreter:
-    if mode == ProcessingMode.FICTION:
-        return FictionInterpreter()
-    elif mode == ProcessingMode.TRUTH:
-        return TruthInterpreter()
-    else:
-        return MapInterpreter()
+    interpreter = _interpreters.get(mode)
+    if interpreter is None:
+        interpreter = _INTERPRETER_CLASSES.get(mode, MapInterpreter)()
+        _interpreters[mode] = interpreter
+    return interpreter
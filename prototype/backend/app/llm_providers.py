@@ -1,65 +1,170 @@
 from abc import ABC, abstractmethod
 import subprocess
 import json
-from typing import Dict, Any, Optional
+import os
+import re
+import tempfile
+import threading
+from typing import BinaryIO, Dict, Any, Optional
 
 class LLMProvider(ABC):
+    # True if generate_json ignores the prompt (fixtures), so callers can skip building one
+    deterministic: bool = False
+    
     @abstractmethod
     def generate_json(self, prompt: str) -> Dict[str, Any]:
         """Generates JSON output from the LLM based on the prompt."""
         pass
 
+# Bytes that can change the brace depth: braces, and quotes/backslashes (braces inside strings don't count)
+_JSON_SIGNIFICANT = re.compile(rb'[{}"\\]')
+
+
+def _read_first_json_object(stream: BinaryIO, chunk_size: int = 4096) -> Optional[bytes]:
+    """
+    Reads `stream` until the first top-level {...} object is complete and returns
+    its bytes, without buffering anything before it or reading anything after it.
+    Returns None if the stream ends first.
+    """
+    buf = bytearray()
+    depth = 0
+    in_string = False
+    escape = False
+    
+    while True:
+        chunk = stream.read1(chunk_size)
+        if not chunk:
+            return None
+        
+        pos = 0
+        if depth == 0:
+            # Skip any chatter before the object
+            pos = chunk.find(b'{')
+            if pos == -1:
+                continue
+        
+        start = pos
+        if escape:
+            # The previous chunk ended on a backslash inside a string
+            escape = False
+            pos += 1
+        
+        while True:
+            match = _JSON_SIGNIFICANT.search(chunk, pos)
+            if match is None:
+                break
+            i = match.start()
+            c = chunk[i]
+            pos = i + 1
+            
+            if in_string:
+                if c == 0x5C:  # backslash
+                    if pos < len(chunk):
+                        pos += 1
+                    else:
+                        escape = True
+                elif c == 0x22:  # quote
+                    in_string = False
+            elif c == 0x22:
+                in_string = True
+            elif c == 0x7B:  # {
+                depth += 1
+            elif c == 0x7D:  # }
+                depth -= 1
+                if depth == 0:
+                    buf += chunk[start:pos]
+                    return bytes(buf)
+        
+        buf += chunk[start:]
+
+
 class CodexCLIProvider(LLMProvider):
+    TIMEOUT = 30  # seconds
+    
     def generate_json(self, prompt: str) -> Dict[str, Any]:
         """Uses the local 'codex' CLI command to generate JSON."""
         try:
             # Construct the full prompt to force JSON
             full_prompt = f"{prompt}\nReturn ONLY valid JSON."
             
-            # Run the command
-            # We use a timeout to prevent hanging
-            process = subprocess.Popen(
-                ["codex"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate(input=full_prompt, timeout=30)
-            
-            if process.returncode != 0:
-                print(f"Codex Error: {stderr}")
-                return {}
-
-            # Attempt to parse JSON from stdout
-            # It might contain other text, so we look for the first { and last }
-            output = stdout.strip()
-            start = output.find('{')
-            end = output.rfind('}') + 1
-            
-            if start != -1 and end != -1:
-                json_str = output[start:end]
-                return json.loads(json_str)
-            else:
-                print(f"Could not find JSON in Codex output: {output}")
+            # Run the command in binary mode; the JSON is decoded once at the end.
+            # stderr goes to a temp file so a chatty CLI can't block on a full pipe
+            # while we are reading stdout.
+            with tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(
+                    ["codex"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file
+                )
+                
+                # We use a timeout to prevent hanging: killing the process ends the read below
+                timed_out = threading.Event()
+                
+                def _kill():
+                    timed_out.set()
+                    process.kill()
+                
+                timer = threading.Timer(self.TIMEOUT, _kill)
+                timer.start()
+                try:
+                    try:
+                        process.stdin.write(full_prompt.encode())
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                    
+                    # Stop reading as soon as the first JSON object is complete
+                    json_bytes = _read_first_json_object(process.stdout)
+                finally:
+                    timer.cancel()
+                    process.stdout.close()
+                    if process.poll() is None:
+                        # Done with it (or failed); don't let a child that ignores SIGTERM hang us
+                        process.terminate()
+                        try:
+                            process.wait(timeout=1)
+                        except subprocess.TimeoutExpired:
+                            process.kill()
+                    process.wait()
+                
+                if timed_out.is_set():
+                    print("Codex command timed out.")
+                    return {}
+                
+                if json_bytes is not None:
+                    return json.loads(json_bytes)
+                
+                if process.returncode != 0:
+                    stderr_file.seek(0)
+                    print(f"Codex Error: {stderr_file.read().decode(errors='replace')}")
+                    return {}
+                
+                print("Could not find JSON in Codex output")
                 return {}
                 
-        except subprocess.TimeoutExpired:
-            process.kill()
-            print("Codex command timed out.")
-            return {}
         except Exception as e:
             print(f"Error calling Codex: {e}")
             return {}
 
 class MockProvider(LLMProvider):
+    deterministic = True
+    MOCK_PATH = os.path.join(os.path.dirname(__file__), "../llm_output.json")
+    
+    # The parsed fixture, shared by all instances and reloaded only when the file changes.
+    # Callers must treat the returned dict as read-only.
+    _cache: Optional[Dict[str, Any]] = None
+    _cache_mtime: float = 0.0
+    
     def generate_json(self, prompt: str) -> Dict[str, Any]:
         # Return the static mock data
-        import os
-        mock_path = os.path.join(os.path.dirname(__file__), "../llm_output.json")
+        cls = type(self)
         try:
-            with open(mock_path, 'r') as f:
-                return json.load(f)
-        except:
+            mtime = os.stat(self.MOCK_PATH).st_mtime
+            if cls._cache is None or mtime != cls._cache_mtime:
+                with open(self.MOCK_PATH, 'rb') as f:
+                    cls._cache = json.load(f)
+                cls._cache_mtime = mtime
+            return cls._cache
+        except (OSError, json.JSONDecodeError):
             return {}
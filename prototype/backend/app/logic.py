@@ -1,4 +1,5 @@
-from typing import List, Dict, Tuple, Any
+from collections import defaultdict
+from typing import List, Dict, Tuple, Any, Optional
 from app.models import MeaningGraph, Assertion
 
 class LogicEngine:
@@ -10,43 +11,37 @@ class LogicEngine:
         """
         Finds potential contradictions in the assertions.
         Current heuristic: Same Subject + Same Predicate + Different Object
+        under the same Condition
         (excluding cases where object is None, or Modality differs significantly)
         """
         contradictions = []
-        seen: Dict[Tuple[str, str], Assertion] = {}
+        # Key: (Subject, Predicate, Condition) -> [(normalized object, assertion), ...]
+        # Subject/predicate/object are compared case-folded for looser matching.
+        # Conditions must match exactly: if they differ, the assertions might not
+        # contradict (e.g. "If rain, stay. If sun, go.")
+        buckets: Dict[Tuple[str, str, Optional[str]], List[Tuple[str, Assertion]]] = defaultdict(list)
 
         for assertion in self.assertions:
-            # Key: (Subject, Predicate)
-            # We normalize to lower case for looser matching
-            key = (assertion.subject.lower(), assertion.predicate.lower())
+            key = (assertion.subject_norm, assertion.predicate_norm, assertion.condition)
+            obj = assertion.object_norm
+            bucket = buckets[key]
             
-            if key in seen:
-                prev_assertion = seen[key]
-                
-                # Check for conflict
-                # 1. Objects must differ
-                # 2. Neither object should be None (unless one implies absence?)
-                # 3. Conditions should be similar (if one is conditional and other is not, it might not be a contradiction)
-                
-                obj1 = prev_assertion.object
-                obj2 = assertion.object
-                
-                if obj1 and obj2 and obj1.lower() != obj2.lower():
-                    # Potential contradiction
-                    # Check conditions
-                    cond1 = prev_assertion.condition
-                    cond2 = assertion.condition
-                    
-                    # If conditions are different, they might not contradict (e.g. "If rain, stay. If sun, go.")
-                    if cond1 == cond2:
-                        contradictions.append({
-                            "type": "DirectConflict",
-                            "assertion_1": prev_assertion,
-                            "assertion_2": assertion,
-                            "reason": f"Conflicting objects: '{obj1}' vs '{obj2}'"
-                        })
-            else:
-                seen[key] = assertion
+            # Neither object may be None (unless one implies absence?)
+            if obj is None:
+                continue
+            
+            # Compare against every earlier assertion in the bucket, so a third
+            # conflicting claim is reported against each of the first two
+            for prev_obj, prev_assertion in bucket:
+                if prev_obj != obj:
+                    contradictions.append({
+                        "type": "DirectConflict",
+                        "assertion_1": prev_assertion,
+                        "assertion_2": assertion,
+                        "reason": f"Conflicting objects: '{prev_assertion.object}' vs '{assertion.object}'"
+                    })
+            
+            bucket.append((obj, assertion))
                 
         return contradictions
 
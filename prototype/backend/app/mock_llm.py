@@ -1,15 +1,26 @@
 import json
 import os
-from app.models import MeaningGraph, Node, Edge, Span, Provenance
+import re
+from app.models import MeaningGraph, Node, Edge, Span, Provenance, NodeType, EdgeRole
 from app.llm_providers import LLMProvider
 
+_NODE_TYPES = {t.value: t for t in NodeType}
+_EDGE_ROLES = {r.value: r for r in EdgeRole}
+
+# Picks the mock fixture for a text. Each alternative is a set of lookaheads
+# (substring tests), tried in order, so earlier cases win when several apply.
+_TEST_CASE_ROUTER = re.compile(
+    r"(?P<eyes>(?=.*blue)(?=.*brown))"
+    r"|(?P<gregor>(?=.*Gregor))",
+    re.S
+)
+
 class LLMGraphParser:
     def __init__(self, provider: LLMProvider):
         self.provider = provider
 
-    def parse(self, text: str) -> MeaningGraph:
-        # Prompt engineering
-        prompt = f"""
+    def _build_prompt(self, text: str) -> str:
+        return f"""
 Extract entities and edges from the following text:
 "{text}"
 
@@ -23,6 +34,13 @@ Return a JSON object with this schema:
   ]
 }}
 """
+
+    def parse(self, text: str) -> MeaningGraph:
+        # Prompt engineering (skipped for fixture providers, which never read it)
+        if getattr(self.provider, "deterministic", False):
+            prompt = ""
+        else:
+            prompt = self._build_prompt(text)
         data = self.provider.generate_json(prompt)
         
         if not data:
@@ -31,34 +49,37 @@ Return a JSON object with this schema:
         # Handle new "test_cases" structure if present
         if "test_cases" in data:
             # Simple routing logic
-            if "blue" in text and "brown" in text:
-                graph_data = data["test_cases"]["eyes"]
-            elif "Gregor" in text:
-                graph_data = data["test_cases"]["gregor"]
-            else:
+            match = _TEST_CASE_ROUTER.match(text)
+            if match is None:
                 return MeaningGraph(nodes=[], edges=[])
+            graph_data = data["test_cases"][match.lastgroup]
         else:
             # Fallback to old flat structure (if any)
             graph_data = data
 
         try:
+            # The fixture/LLM rows are plain JSON, so build the models without
+            # re-running validation per row; unknown types/roles still fail below.
             nodes = []
             for n in graph_data.get("nodes", []):
-                nodes.append(Node(
+                span = n.get("span")
+                nodes.append(Node.model_construct(
                     id=n["id"],
                     label=n["label"],
-                    type=n["type"],
-                    properties=n.get("properties", {}),
-                    span=Span(**n["span"]) if "span" in n else None
+                    type=_NODE_TYPES[n["type"]],
+                    properties=n.get("properties") or {},
+                    span=Span.model_construct(**span) if span else None
                 ))
             
+            # Every edge has the same provenance, so they share one instance
+            provenance = Provenance(engine_id="llm-provider", engine_version="1.0")
             edges = []
             for e in graph_data.get("edges", []):
-                edges.append(Edge(
+                edges.append(Edge.model_construct(
                     source=e["source"],
                     target=e["target"],
-                    role=e["role"],
-                    provenance=[Provenance(engine_id="llm-provider", engine_version="1.0")]
+                    role=_EDGE_ROLES[e["role"]],
+                    provenance=[provenance]
                 ))
                 
             return MeaningGraph(nodes=nodes, edges=edges)
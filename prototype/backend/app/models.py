@@ -1,5 +1,7 @@
+import sys
 from typing import List, Dict, Optional, Any, Union
 from enum import Enum
+from functools import cached_property
 from pydantic import BaseModel, Field
 
 # Enums
@@ -68,7 +70,7 @@ class Provenance(BaseModel):
     engine_id: str
     engine_version: str
     confidence: float = 1.0
-    receipts: List[Dict[str, Any]] = []
+    receipts: List[Dict[str, Any]] = Field(default_factory=list)
 
 # Graph Components
 class Node(BaseModel):
@@ -76,7 +78,12 @@ class Node(BaseModel):
     type: NodeType
     label: str
     span: Optional[Span] = None
-    properties: Dict[str, Any] = {}
+    properties: Dict[str, Any] = Field(default_factory=dict)
+    
+    @cached_property
+    def label_norm(self) -> str:
+        """Case-folded label for comparisons. Computed once, never serialized."""
+        return self.label.casefold()
 
 class Edge(BaseModel):
     source: str
@@ -102,22 +109,23 @@ class ContextFrame(BaseModel):
     time_anchor: Optional[str] = None
     source_doc: Optional[str] = None
     modality_hint: Optional[str] = None
-    local_definitions: Dict[str, Any] = {}
+    local_definitions: Dict[str, Any] = Field(default_factory=dict)
 
 class Diagnostic(BaseModel):
     kind: DiagnosticKind
     severity: Severity
     message: str
     provenance: Optional[List[Provenance]] = None
+    terms: List[str] = Field(default_factory=list)  # The words the diagnostic is about, e.g. the two halves of an oxymoron
 
 class MeaningGraph(BaseModel):
-    nodes: List[Node] = []
-    edges: List[Edge] = []
-    ambiguity_sets: List[AmbiguitySet] = []
-    context_frames: List[ContextFrame] = []
-    diagnostics: List[Diagnostic] = []
-    provenance: List[Provenance] = []
-    assertions: List['Assertion'] = []
+    nodes: List[Node] = Field(default_factory=list)
+    edges: List[Edge] = Field(default_factory=list)
+    ambiguity_sets: List[AmbiguitySet] = Field(default_factory=list)
+    context_frames: List[ContextFrame] = Field(default_factory=list)
+    diagnostics: List[Diagnostic] = Field(default_factory=list)
+    provenance: List[Provenance] = Field(default_factory=list)
+    assertions: List['Assertion'] = Field(default_factory=list)
 
 class Assertion(BaseModel):
     subject: str
@@ -127,6 +135,22 @@ class Assertion(BaseModel):
     condition: Optional[str] = None # e.g., "if X"
     source_event_id: str
     confidence: float = 1.0
+    
+    # Case-folded subject/predicate/object for grouping and comparison,
+    # computed once per assertion and never serialized (like Node.label_norm).
+    # They are interned: the same few subjects/predicates repeat across a
+    # document, so equal values share one string and compare by identity.
+    @cached_property
+    def subject_norm(self) -> str:
+        return sys.intern(self.subject.casefold())
+    
+    @cached_property
+    def predicate_norm(self) -> str:
+        return sys.intern(self.predicate.casefold())
+    
+    @cached_property
+    def object_norm(self) -> Optional[str]:
+        return sys.intern(self.object.casefold()) if self.object else None
 
 # API Models
 class CreateDocRequest(BaseModel):
@@ -146,6 +170,11 @@ class AnalyzeRequest(BaseModel):
     docId: str
     options: Optional[AnalyzeOptions] = None
 
+class AnalyzeTextRequest(BaseModel):
+    text: str
+    lang: str = "en"
+    options: Optional[AnalyzeOptions] = None
+
 class DocResponse(BaseModel):
     id: str
     text: str
@@ -156,3 +185,6 @@ class AnalysisSummary(BaseModel):
     docId: str
     graph_summary: Dict[str, int] # e.g., {"nodes": 10, "edges": 15}
     top_diagnostics: List[Diagnostic]
+
+class TextAnalysisResponse(MeaningGraph):
+    docId: str
@@ -1,26 +1,139 @@
+import os
+import logging
+import threading
+import numpy as np
 import spacy
-import uuid
-from typing import Dict, Any, List
-from app.models import MeaningGraph, Node, Edge, NodeType, EdgeRole, Span, Provenance, ContextFrame
+from spacy.attrs import POS
+from spacy.parts_of_speech import VERB, AUX
+from typing import Dict, Any, Iterable, List, Tuple
+from app.models import MeaningGraph, Node, Edge, NodeType, EdgeRole, Span, Provenance, ContextFrame, Diagnostic
+from app.ids import fast_id
+from app.ambiguity import AmbiguityManager
+from app.coref import CoreferenceResolver
+from app.mock_llm import LLMGraphParser
+from app.llm_providers import MockProvider, CodexCLIProvider
+from app.assertions import AssertionExtractor
+from app.checkers.continuity import ContinuityChecker
+from app.checkers.oxymoron import OxymoronChecker
+from app.checkers.ambiguity import AmbiguityChecker
+from app.checkers.discourse import DiscourseChecker
 
-class Pipeline:
-    def __init__(self, model_name: str = "en_core_web_sm"):
+logger = logging.getLogger(__name__)
+
+SPACY_VERSION = spacy.__version__
+
+# The Gregor Samsa demo swaps in the LLM parser's graph for that text.
+# ENABLE_LLM_OVERRIDE_DEMO=false skips the check entirely.
+LLM_OVERRIDE_ENABLED = os.getenv("ENABLE_LLM_OVERRIDE_DEMO", "true").lower() == "true"
+
+# Lemmas of verbs that introduce a goal ("I want to build ...")
+GOAL_LEMMAS = frozenset({"want", "need", "desire", "aim", "plan"})
+FIRST_PERSON = frozenset({"i", "we"})
+SUBJECT_DEPS = frozenset({"nsubj", "nsubjpass"})
+
+# Modality signalled by an auxiliary's lemma
+AUX_MODALITY = {
+    **dict.fromkeys(("can", "could", "may", "might"), "possible"),
+    **dict.fromkeys(("must", "should", "ought", "need"), "necessary"),
+    **dict.fromkeys(("will", "shall"), "future"),
+}
+
+# Dependency labels that map straight to an argument role.
+# auxpass, prep, advcl and conj need to look at the child's own children.
+DEP_TO_ROLE = {
+    "nsubj": EdgeRole.AGENT,
+    "nsubjpass": EdgeRole.AGENT,
+    "dobj": EdgeRole.PATIENT,
+    "pobj": EdgeRole.PATIENT,
+    "acomp": EdgeRole.THEME,
+    "attr": EdgeRole.THEME,
+    "advmod": EdgeRole.THEME,
+    # Markers like "because", "if", "while": the DiscoursePlugin needs their
+    # nodes, so they are linked to the event with a weak Support edge
+    "mark": EdgeRole.SUPPORT,
+}
+
+# Role of a prepositional object, by the preposition's lemma (anything else is a Theme)
+PREP_ROLE = {
+    **dict.fromkeys(("in", "at", "on"), EdgeRole.LOCATION),
+    "into": EdgeRole.THEME,  # or Goal/Result
+    "by": EdgeRole.AGENT,
+}
+
+# Role of an adverbial clause, by its marker (anything else is Support)
+MARKER_ROLE = {
+    **dict.fromkeys(("if", "unless", "provided"), EdgeRole.CONDITION),
+    **dict.fromkeys(("before", "after", "while", "since", "until"), EdgeRole.SEQUENCE),
+}
+
+# Adverbs that make a conjoined verb a Sequence ("... and then ...")
+SEQUENCE_ADVERBS = frozenset({"then", "later", "subsequently"})
+
+# Loaded spaCy models, keyed by name, shared by every Pipeline instance
+_nlp_cache: Dict[str, Any] = {}
+
+# Components process() never reads from. Excluded ones aren't even loaded;
+# names a model doesn't have are ignored. Everything else is used: tagger
+# (tag_), attribute_ruler (pos_), lemmatizer (lemma_), parser (dep_, children)
+# and ner (ents), plus the tok2vec they share.
+UNUSED_PIPES = ("senter", "textcat", "textcat_multilabel")
+
+# Below this many texts, starting parser worker processes costs more than it saves
+MULTIPROCESS_MIN_ITEMS = 50
+
+def load_nlp(model_name: str):
+    if model_name not in _nlp_cache:
         try:
-            self.nlp = spacy.load(model_name)
+            _nlp_cache[model_name] = spacy.load(model_name, exclude=UNUSED_PIPES)
         except OSError:
             from spacy.cli import download
             download(model_name)
-            self.nlp = spacy.load(model_name)
+            _nlp_cache[model_name] = spacy.load(model_name, exclude=UNUSED_PIPES)
+    return _nlp_cache[model_name]
+
+class Pipeline:
+    def __init__(self, model_name: str = "en_core_web_sm"):
+        self.nlp = load_nlp(model_name)
+        
+        # The analysis stages keep no per-document state, so one of each is reused for every call
+        self.ambiguity_manager = AmbiguityManager()
+        self.coref_resolver = CoreferenceResolver()
+        self.assertion_extractor = AssertionExtractor()
+        self.continuity_checker = ContinuityChecker()
+        self.oxymoron_checker = OxymoronChecker()
+        self.ambiguity_checker = AmbiguityChecker()
+        self.discourse_checker = DiscourseChecker()
             
     def process(self, text: str, doc_id: str) -> MeaningGraph:
-        doc = self.nlp(text)
+        return self._build_graph(self.nlp(text), text, doc_id)
+    
+    def process_batch(self, items: Iterable[Tuple[str, str]], batch_size: int = 64,
+                      n_process: int = 1  # ignored below MULTIPROCESS_MIN_ITEMS items
+                      ) -> List[MeaningGraph]:
+        """
+        Processes many (text, doc_id) pairs at once. spaCy parses the texts as a
+        stream via nlp.pipe(), which is much faster than one nlp() call per text.
         
-        nodes = []
+        For bulk jobs (importing or re-analyzing a whole history), n_process > 1
+        (or -1 for one per CPU) parses in worker processes, and batch sizes of
+        roughly 25-75 tend to work best. Each worker loads its own copy of the
+        model, so n_process is ignored (treated as 1) when there are fewer than
+        MULTIPROCESS_MIN_ITEMS items.
+        """
+        items = list(items)
+        if len(items) < MULTIPROCESS_MIN_ITEMS:
+            n_process = 1
+        docs = self.nlp.pipe((text for text, _ in items), batch_size=batch_size, n_process=n_process)
+        return [self._build_graph(doc, text, doc_id) for doc, (text, doc_id) in zip(docs, items)]
+    
+    def _build_graph(self, doc, text: str, doc_id: str) -> MeaningGraph:
+        # Nodes keyed by id, in insertion order: O(1) duplicate checks, first node wins
+        nodes_by_id: Dict[str, Node] = {}
         edges = []
         context_frames = []
         
         # Create Default Context Frame
-        default_frame_id = f"ctx_{uuid.uuid4().hex[:8]}"
+        default_frame_id = f"ctx_{fast_id(4)}"
         default_frame = ContextFrame(
             frame_id=default_frame_id,
             frame_type="RealWorld",
@@ -28,8 +141,16 @@ class Pipeline:
         )
         context_frames.append(default_frame)
         
+        # Every dependency edge has the same provenance, so they share one instance
+        dep_provenance = Provenance(engine_id="spacy-dep", engine_version=SPACY_VERSION)
+        
+        # Entity covering each token (None outside entities), for O(1) argument lookups
+        token_to_ent = [None] * len(doc)
+        
         # Entity Extraction
         for ent in doc.ents:
+            for i in range(ent.start, ent.end):
+                token_to_ent[i] = ent
             node = Node(
                 id=f"ent_{ent.start}",
                 type=NodeType.ENTITY,
@@ -37,225 +158,170 @@ class Pipeline:
                 span=Span(start=ent.start_char, end=ent.end_char, text=ent.text),
                 properties={"label": ent.label_, "frame_id": default_frame_id}
             )
-            nodes.append(node)
+            nodes_by_id[node.id] = node
             
         # Event & Claim Extraction (Dependency Parse)
-        for token in doc:
-            if token.pos_ in ("VERB", "AUX"):
-                # Check for Goal Patterns (e.g. "I want to build")
-                # Pattern: Subject "I" + Verb "want" + xcomp "build"
-                is_goal = False
-                if token.lemma_ in ("want", "need", "desire", "aim", "plan"):
-                    # Check if subject is "I" or "we"
-                    subj = next((c for c in token.children if c.dep_ in ("nsubj", "nsubjpass")), None)
-                    if subj and subj.text.lower() in ("i", "we"):
-                        # Check for xcomp (the actual goal verb)
-                        goal_verb = next((c for c in token.children if c.dep_ == "xcomp"), None)
-                        if goal_verb:
-                            # This is a goal!
-                            # We want to make the *goal_verb* the main node, but type=GOAL
-                            # And maybe link "want" as a property or edge?
-                            # For MVP: Let's make the goal_verb the GOAL node.
-                            
-                            # Skip the "want" node creation (or make it a support edge later)
-                            # Actually, let's handle the goal_verb when we reach it in the loop?
-                            # No, better to handle it here to capture the full context.
-                            pass
+        # Only verbs and auxiliaries start events. Find them with one pass over the
+        # POS column instead of building token.pos_ strings for every token.
+        pos = doc.to_array(POS)
+        for i in np.flatnonzero((pos == VERB) | (pos == AUX)).tolist():
+            token = doc[i]
+            # Check for Goal Patterns (e.g. "I want to build")
+            # Pattern: Subject "I" + Verb "want" + xcomp "build"
+            # The goal verb ("build") becomes the GOAL node, so check whether this
+            # token IS the goal verb (target of a "want"): parent is "want/need"
+            # and dep is "xcomp"
+            is_goal = False
+            if token.dep_ == "xcomp" and token.head.lemma_ in GOAL_LEMMAS:
+                # Double check subject of head
+                head_subj = next((c for c in token.head.children if c.dep_ in SUBJECT_DEPS), None)
+                if head_subj and head_subj.text.lower() in FIRST_PERSON:
+                    is_goal = True
 
-                # Check if this token IS the goal verb (target of a "want")
-                # Parent is "want/need" and dep is "xcomp"
-                if token.dep_ == "xcomp" and token.head.lemma_ in ("want", "need", "desire", "aim", "plan"):
-                     # Double check subject of head
-                    head_subj = next((c for c in token.head.children if c.dep_ in ("nsubj", "nsubjpass")), None)
-                    if head_subj and head_subj.text.lower() in ("i", "we"):
-                        is_goal = True
+            # The children are walked twice below; materialize them once
+            children = list(token.children)
+            
+            # Linguistic Nuance Extraction (Modality & Negation)
+            modality = "factual" # default
+            polarity = "positive" # default
+            
+            for child in children:
+                dep = child.dep_
+                if dep == "neg":
+                    polarity = "negative"
+                elif dep == "aux":
+                    modality = AUX_MODALITY.get(child.lemma_, modality)
 
-                # Linguistic Nuance Extraction (Modality & Negation)
-                modality = "factual" # default
-                polarity = "positive" # default
+            # Event Node (or Goal Node)
+            event_id = f"evt_{token.i}"
+            node_type = NodeType.GOAL if is_goal else NodeType.EVENT
+            
+            event_node = Node(
+                id=event_id,
+                type=node_type,
+                label=token.lemma_,
+                span=Span(start=token.idx, end=token.idx + len(token.text), text=token.text),
+                properties={
+                    "pos": token.pos_, 
+                    "tag": token.tag_, 
+                    "frame_id": default_frame_id,
+                    "modality": modality,
+                    "polarity": polarity
+                }
+            )
+            nodes_by_id[event_id] = event_node
+            
+            # Find Arguments (Subject/Object/Prepositions)
+            for child in children:
+                dep = child.dep_
+                # Direct mappings come from the table; the rest are special-cased below
+                role = DEP_TO_ROLE.get(dep)
+                target_token = child
                 
-                for child in token.children:
-                    if child.dep_ == "neg":
-                        polarity = "negative"
-                    if child.dep_ == "aux":
-                        if child.lemma_ in ("can", "could", "may", "might"):
-                            modality = "possible"
-                        elif child.lemma_ in ("must", "should", "ought", "need"):
-                            modality = "necessary"
-                        elif child.lemma_ in ("will", "shall"):
-                            modality = "future"
+                if dep == "auxpass":
+                    role = EdgeRole.SUPPORT
+                    # Handle subject attached to auxpass (e.g. "bank" in "bank is closed")
+                    for gc in child.children:
+                        if gc.dep_ in SUBJECT_DEPS:
+                            gc_id = f"tok_{gc.i}"
+                            # Check entity match
+                            ent_match_gc = token_to_ent[gc.i]
+                            if ent_match_gc:
+                                gc_id = f"ent_{ent_match_gc.start}"
+                            elif gc_id not in nodes_by_id:
+                                # Check for adjectival modifiers (amod) to include in label
+                                # e.g. "blue eyes" instead of just "eyes"
+                                label_parts = []
+                                for mod_child in gc.children: # Iterate over children of gc (the subject)
+                                    if mod_child.dep_ == "amod":
+                                        label_parts.append(mod_child.text)
+                                label_parts.append(gc.text) # Add the subject's text itself
+                                full_label = " ".join(label_parts)
 
-                # Event Node (or Goal Node)
-                event_id = f"evt_{token.i}"
-                node_type = NodeType.GOAL if is_goal else NodeType.EVENT
-                
-                event_node = Node(
-                    id=event_id,
-                    type=node_type,
-                    label=token.lemma_,
-                    span=Span(start=token.idx, end=token.idx + len(token.text), text=token.text),
-                    properties={
-                        "pos": token.pos_, 
-                        "tag": token.tag_, 
-                        "frame_id": default_frame_id,
-                        "modality": modality,
-                        "polarity": polarity
-                    }
-                )
-                nodes.append(event_node)
+                                nodes_by_id[gc_id] = Node(
+                                    id=gc_id,
+                                    type=NodeType.ENTITY,
+                                    label=full_label, # Use full label with modifiers
+                                    span=Span(start=gc.idx, end=gc.idx + len(gc.text), text=gc.text),
+                                    properties={"pos": gc.pos_, "frame_id": default_frame_id}
+                                )
+                            
+                            edges.append(Edge(
+                                source=event_id,
+                                target=gc_id,
+                                role=EdgeRole.THEME,
+                                provenance=[dep_provenance]
+                            ))
+                elif dep == "prep":
+                    # Handle preposition chain: event -> prep -> pobj
+                    # e.g. transformed -> into -> insect
+                    pobj = next((c for c in child.children if c.dep_ == "pobj"), None)
+                    if pobj:
+                        target_token = pobj
+                        # Heuristic mapping of prepositions to roles
+                        role = PREP_ROLE.get(child.lemma_, EdgeRole.THEME)
                 
-                # Find Arguments (Subject/Object/Prepositions)
-                for child in token.children:
-                    role = None
-                    target_token = child
-                    
-                    if child.dep_ in ("nsubj", "nsubjpass"):
-                        role = EdgeRole.AGENT
-                    elif child.dep_ in ("dobj", "pobj"):
-                        role = EdgeRole.PATIENT
-                    elif child.dep_ in ("acomp", "attr", "advmod"):
-                        role = EdgeRole.THEME
-                    elif child.dep_ == "auxpass":
+                elif dep == "advcl":
+                    # Adverbial clause modifier (conditional, temporal)
+                    marker = next((c for c in child.children if c.dep_ == "mark"), None)
+                    if marker:
+                        role = MARKER_ROLE.get(marker.text.lower(), EdgeRole.SUPPORT)
+                    else:
                         role = EdgeRole.SUPPORT
-                        # Handle subject attached to auxpass (e.g. "bank" in "bank is closed")
-                        for gc in child.children:
-                            if gc.dep_ in ("nsubj", "nsubjpass"):
-                                gc_id = f"tok_{gc.i}"
-                                # Check entity match
-                                ent_match_gc = next((e for e in doc.ents if e.start <= gc.i < e.end), None)
-                                if ent_match_gc:
-                                    gc_id = f"ent_{ent_match_gc.start}"
-                                else:
-                                    # Check for adjectival modifiers (amod) to include in label
-                                    # e.g. "blue eyes" instead of just "eyes"
-                                    label_parts = []
-                                    for mod_child in gc.children: # Iterate over children of gc (the subject)
-                                        if mod_child.dep_ == "amod":
-                                            label_parts.append(mod_child.text)
-                                    label_parts.append(gc.text) # Add the subject's text itself
-                                    full_label = " ".join(label_parts)
-
-                                    gc_node = Node(
-                                        id=gc_id,
-                                        type=NodeType.ENTITY,
-                                        label=full_label, # Use full label with modifiers
-                                        span=Span(start=gc.idx, end=gc.idx + len(gc.text), text=gc.text),
-                                        properties={"pos": gc.pos_, "frame_id": default_frame_id}
-                                    )
-                                    if not any(n.id == gc_id for n in nodes):
-                                        nodes.append(gc_node)
-                                
-                                edges.append(Edge(
-                                    source=event_id,
-                                    target=gc_id,
-                                    role=EdgeRole.THEME,
-                                    provenance=[Provenance(engine_id="spacy-dep", engine_version=spacy.__version__)]
-                                ))
-                    elif child.dep_ == "mark":
-                        # Extract markers like "because", "if", "while"
-                        # These are needed for DiscoursePlugin
-                        target_token = child
-                        # We don't necessarily create an edge from the event to the marker with a specific role
-                        # But we need the node to exist. 
-                        # Let's link it as a 'Support' or generic 'Marker' role for connectivity, 
-                        # or just ensure the node is created.
-                        # For now, let's treat it as a 'Theme' or just not link it with a strong role?
-                        # Actually, let's just add the node. The DiscoursePlugin looks for nodes.
-                        # But if we don't add an edge, it might be an orphan node (which is allowed).
-                        # Let's add it as a node first.
-                        pass # Logic below adds the node.
-                        
-                        # Optionally link it to the event
-                        role = EdgeRole.SUPPORT # Weak link
-
-                    elif child.dep_ == "prep":
-                        # Handle preposition chain: event -> prep -> pobj
-                        # e.g. transformed -> into -> insect
-                        pobj = next((c for c in child.children if c.dep_ == "pobj"), None)
-                        if pobj:
-                            target_token = pobj
-                            # Heuristic mapping of prepositions to roles
-                            if child.lemma_ in ("in", "at", "on"):
-                                role = EdgeRole.LOCATION
-                            elif child.lemma_ == "into":
-                                role = EdgeRole.THEME # or Goal/Result
-                            elif child.lemma_ == "by":
-                                role = EdgeRole.AGENT
-                            else:
-                                role = EdgeRole.THEME # Default for other prepositions
-                    
-                    elif child.dep_ == "advcl":
-                        # Adverbial clause modifier (conditional, temporal)
-                        marker = next((c for c in child.children if c.dep_ == "mark"), None)
-                        if marker:
-                            marker_text = marker.text.lower()
-                            if marker_text in ("if", "unless", "provided"):
-                                role = EdgeRole.CONDITION
-                            elif marker_text in ("before", "after", "while", "since", "until"):
-                                role = EdgeRole.SEQUENCE
-                            else:
-                                role = EdgeRole.SUPPORT
-                        else:
-                            role = EdgeRole.SUPPORT
-                        target_token = child
+                    target_token = child
 
-                    elif child.dep_ == "conj":
-                        # Conjunction (sequence or list)
-                        # Check for 'then' or 'later'
-                        has_then = any(c.text.lower() in ("then", "later", "subsequently") for c in child.children)
-                        if has_then:
-                            role = EdgeRole.SEQUENCE
-                        else:
-                            role = EdgeRole.SUPPORT
-                        target_token = child
+                elif dep == "conj":
+                    # Conjunction (sequence or list)
+                    # Check for 'then' or 'later'
+                    has_then = any(c.text.lower() in SEQUENCE_ADVERBS for c in child.children)
+                    if has_then:
+                        role = EdgeRole.SEQUENCE
+                    else:
+                        role = EdgeRole.SUPPORT
+                    target_token = child
+                
+                if role:
+                    # Find the entity or token node corresponding to this target
+                    target_id = f"tok_{target_token.i}"
                     
-                    if role:
-                        # Find the entity or token node corresponding to this target
-                        target_id = f"tok_{target_token.i}"
+                    # Check if target is part of an entity
+                    ent_match = token_to_ent[target_token.i]
+                    if ent_match:
+                        target_id = f"ent_{ent_match.start}"
+                    elif target_id not in nodes_by_id:
+                        # Create a node for this argument if it's not an entity (or already made)
                         
-                        # Check if target is part of an entity
-                        ent_match = next((e for e in doc.ents if e.start <= target_token.i < e.end), None)
-                        if ent_match:
-                            target_id = f"ent_{ent_match.start}"
-                        else:
-                            # Create a node for this argument if it's not an entity
-                            
-                            # Check for adjectival modifiers (amod) to include in label
-                            # e.g. "blue eyes" instead of just "eyes"
-                            label_parts = []
-                            for mod_child in target_token.children:
-                                if mod_child.dep_ == "amod":
-                                    label_parts.append(mod_child.text)
-                            label_parts.append(target_token.text)
-                            full_label = " ".join(label_parts)
-
-                            arg_node = Node(
-                                id=target_id,
-                                type=NodeType.ENTITY, # Broadly entity
-                                label=full_label, # Use full label with modifiers
-                                span=Span(start=target_token.idx, end=target_token.idx + len(target_token.text), text=target_token.text),
-                                properties={"pos": target_token.pos_, "frame_id": default_frame_id}
-                            )
-                            # Avoid duplicates
-                            if not any(n.id == target_id for n in nodes):
-                                nodes.append(arg_node)
+                        # Check for adjectival modifiers (amod) to include in label
+                        # e.g. "blue eyes" instead of just "eyes"
+                        label_parts = []
+                        for mod_child in target_token.children:
+                            if mod_child.dep_ == "amod":
+                                label_parts.append(mod_child.text)
+                        label_parts.append(target_token.text)
+                        full_label = " ".join(label_parts)
 
-                        edge = Edge(
-                            source=event_id,
-                            target=target_id,
-                            role=role,
-                            provenance=[Provenance(engine_id="spacy-dep", engine_version=spacy.__version__)]
+                        nodes_by_id[target_id] = Node(
+                            id=target_id,
+                            type=NodeType.ENTITY, # Broadly entity
+                            label=full_label, # Use full label with modifiers
+                            span=Span(start=target_token.idx, end=target_token.idx + len(target_token.text), text=target_token.text),
+                            properties={"pos": target_token.pos_, "frame_id": default_frame_id}
                         )
-                        edges.append(edge)
+
+                    edge = Edge(
+                        source=event_id,
+                        target=target_id,
+                        role=role,
+                        provenance=[dep_provenance]
+                    )
+                    edges.append(edge)
 
         # Ambiguity Detection
-        from app.ambiguity import AmbiguityManager
-        ambiguity_manager = AmbiguityManager()
-        amb_sets, amb_diagnostics = ambiguity_manager.detect_ambiguities(text, doc_id)
+        amb_sets, amb_diagnostics = self.ambiguity_manager.detect_ambiguities(text, doc_id)
         
         # Construct Meaning Graph
         graph = MeaningGraph(
-            nodes=nodes,
+            nodes=list(nodes_by_id.values()),
             edges=edges,
             ambiguity_sets=amb_sets,
             context_frames=context_frames,
@@ -263,66 +329,55 @@ class Pipeline:
             provenance=[
                 Provenance(
                     engine_id="spacy-pipeline",
-                    engine_version=spacy.__version__,
+                    engine_version=SPACY_VERSION,
                     source_doc=doc_id
                 )
             ]
         )
 
-        print(f"[PIPELINE DEBUG] Starting Coreference Resolution")
+        logger.debug("Starting Coreference Resolution")
         # Coreference Resolution (Identity Layer)
-        from app.coref import CoreferenceResolver
-        coref_resolver = CoreferenceResolver()
-        graph = coref_resolver.resolve(doc, graph)
-        print(f"[PIPELINE DEBUG] Coreference Resolution complete. Nodes: {len(graph.nodes)}, Edges: {len(graph.edges)}")
+        graph = self.coref_resolver.resolve(doc, graph)
+        logger.debug("Coreference Resolution complete. Nodes: %d, Edges: %d", len(graph.nodes), len(graph.edges))
 
         # MOCK LLM OVERRIDE (Hybrid Mode)
         # If the text matches our test case, merge/replace with LLM data
         # In a real system, we would check a config flag or user preference
-        print(f"[PIPELINE DEBUG] Checking LLM override condition for text: {text[:50]}...")
-        if "Gregor Samsa" in text and "insect" in text:
-            print(f"[PIPELINE DEBUG] LLM Override TRIGGERED - Loading LLM parser")
-            from app.mock_llm import LLMGraphParser
-            from app.llm_providers import MockProvider, CodexCLIProvider
-            import os
-            
+        logger.debug("Checking LLM override condition for text: %.50s...", text)
+        if LLM_OVERRIDE_ENABLED and "Gregor Samsa" in text and "insect" in text:
+            logger.debug("LLM Override TRIGGERED - Loading LLM parser")
             # Check if we should use real Codex
             use_real_llm = os.getenv("USE_REAL_LLM", "false").lower() == "true"
             
             if use_real_llm:
-                print("Using REAL Codex Provider")
+                logger.debug("Using REAL Codex Provider")
                 provider = CodexCLIProvider()
             else:
-                print("Using MOCK Provider")
+                logger.debug("Using MOCK Provider")
                 provider = MockProvider()
                 
-            print(f"[PIPELINE DEBUG] Parsing text with LLM provider")
+            logger.debug("Parsing text with LLM provider")
             llm_parser = LLMGraphParser(provider)
             llm_graph = llm_parser.parse(text)
-            print(f"[PIPELINE DEBUG] LLM Parse complete. Nodes: {len(llm_graph.nodes)}, Edges: {len(llm_graph.edges)}")
+            logger.debug("LLM Parse complete. Nodes: %d, Edges: %d", len(llm_graph.nodes), len(llm_graph.edges))
             
             if llm_graph.nodes:
                 graph = llm_graph
-                print("Using LLM Graph for Gregor Samsa")
+                logger.debug("Using LLM Graph for Gregor Samsa")
         else:
-            print(f"[PIPELINE DEBUG] LLM Override NOT triggered")
+            logger.debug("LLM Override NOT triggered")
 
-        print(f"[PIPELINE DEBUG] Starting Assertion Extraction")
+        logger.debug("Starting Assertion Extraction")
         # Extract Assertions (Logic Layer)
-        from app.assertions import AssertionExtractor
-        extractor = AssertionExtractor()
-        graph.assertions = extractor.extract(graph)
-        print(f"[PIPELINE DEBUG] Assertion Extraction complete. Assertions: {len(graph.assertions)}")
+        graph.assertions = self.assertion_extractor.extract(graph)
+        logger.debug("Assertion Extraction complete. Assertions: %d", len(graph.assertions))
 
-        print(f"[PIPELINE DEBUG] Starting Continuity Checker")
+        logger.debug("Starting Continuity Checker")
         # Run Continuity Checker (Plugin)
-        from app.checkers.continuity import ContinuityChecker
-        checker = ContinuityChecker()
-        continuity_errors = checker.check(graph)
-        print(f"[PIPELINE DEBUG] Continuity Check complete. Errors: {len(continuity_errors)}")
+        continuity_errors = self.continuity_checker.check(graph)
+        logger.debug("Continuity Check complete. Errors: %d", len(continuity_errors))
         
         # Convert errors to Diagnostics
-        from app.models import Diagnostic
         for error in continuity_errors:
             graph.diagnostics.append(Diagnostic(
                 kind="Contradiction",  # Using Contradiction kind for continuity errors
@@ -332,39 +387,37 @@ class Pipeline:
                 confidence=1.0
             ))
 
-        print(f"[PIPELINE DEBUG] Starting Oxymoron Checker")
+        logger.debug("Starting Oxymoron Checker")
         # Run Oxymoron Checker (Plugin)
-        from app.checkers.oxymoron import OxymoronChecker
-        oxy_checker = OxymoronChecker()
-        oxymoron_diagnostics = oxy_checker.check(graph)
+        oxymoron_diagnostics = self.oxymoron_checker.check(graph)
         graph.diagnostics.extend(oxymoron_diagnostics)
-        print(f"[PIPELINE DEBUG] Oxymoron Check complete. Oxymorons found: {len(oxymoron_diagnostics)}")
+        logger.debug("Oxymoron Check complete. Oxymorons found: %d", len(oxymoron_diagnostics))
 
-        print(f"[PIPELINE DEBUG] Starting Ambiguity Checker")
+        logger.debug("Starting Ambiguity Checker")
         # Run Ambiguity Checker (Plugin)
-        from app.checkers.ambiguity import AmbiguityChecker
-        amb_checker = AmbiguityChecker()
-        amb_diagnostics = amb_checker.check(graph)
+        amb_diagnostics = self.ambiguity_checker.check(graph)
         graph.diagnostics.extend(amb_diagnostics)
-        print(f"[PIPELINE DEBUG] Ambiguity Check complete. Ambiguities found: {len(amb_diagnostics)}")
+        logger.debug("Ambiguity Check complete. Ambiguities found: %d", len(amb_diagnostics))
 
-        print(f"[PIPELINE DEBUG] Starting Discourse Checker")
+        logger.debug("Starting Discourse Checker")
         # Run Discourse Checker (Plugin)
-        from app.checkers.discourse import DiscourseChecker
-        discourse_checker = DiscourseChecker()
         # We pass 'doc' (spacy doc) because DiscourseChecker needs dependency parse
-        discourse_edges = discourse_checker.check(graph, doc)
+        discourse_edges = self.discourse_checker.check(graph, doc)
         graph.edges.extend(discourse_edges)
-        print(f"[PIPELINE DEBUG] Discourse Check complete. Edges added: {len(discourse_edges)}")
+        logger.debug("Discourse Check complete. Edges added: %d", len(discourse_edges))
 
-        print(f"[PIPELINE DEBUG] Returning graph. Total diagnostics: {len(graph.diagnostics)}")
+        logger.debug("Returning graph. Total diagnostics: %d", len(graph.diagnostics))
         return graph
 
 # Singleton instance for now
 _pipeline_instance = None
+_pipeline_lock = threading.Lock()
 
 def get_pipeline():
     global _pipeline_instance
     if _pipeline_instance is None:
-        _pipeline_instance = Pipeline()
+        # Concurrent first calls (sync routes run on a thread pool) must not each load the model
+        with _pipeline_lock:
+            if _pipeline_instance is None:
+                _pipeline_instance = Pipeline()
     return _pipeline_instance
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from app.models import MeaningGraph, Diagnostic, Provenance
 
 class Plugin(ABC):
@@ -20,9 +20,18 @@ class Plugin(ABC):
 class PluginRegistry:
     def __init__(self):
         self._plugins: Dict[str, Plugin] = {}
+        self._snapshot: Tuple[Plugin, ...] = ()
 
     def register(self, plugin: Plugin):
         self._plugins[plugin.engine_id] = plugin
+        self._snapshot = tuple(self._plugins.values())
+
+    def plugins(self) -> Tuple[Plugin, ...]:
+        """Registered plugins in registration order (rebuilt only on register)."""
+        return self._snapshot
+
+    def is_registered(self, engine_id: str) -> bool:
+        return engine_id in self._plugins
 
     def get_plugin(self, engine_id: str) -> Plugin:
         return self._plugins.get(engine_id)
@@ -5,28 +5,149 @@ Enables analyzing messages in the context of conversation history,
 building an accumulated map that grows with each message.
 """
 
+import asyncio
+from collections import OrderedDict
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
 from app.storage import get_storage
 from app.pipeline import get_pipeline
-from app.models import MeaningGraph
-from app.checkers.continuity import ContinuityChecker
-from app.checkers.ambiguity import AmbiguityChecker
+from app.models import MeaningGraph, Node, Edge, Diagnostic
+from app.checkers.continuity import ContinuityChecker, ContinuityIndex
+from app.checkers.ambiguity import AmbiguityChecker, AmbiguityIndex
 from app.checkers.oxymoron import OxymoronChecker
-from app.checkers.cross_message import CrossMessageContradictionChecker
+from app.checkers.cross_message import CrossMessageContradictionChecker, CrossMessageIndex
+from app.checkers.labels import tokenize_labels
 
 router = APIRouter(prefix="/sessions", tags=["session-analysis"])
 storage = get_storage()
 
+# The checkers hold no per-request state, so one instance of each serves every request
+continuity_checker = ContinuityChecker()
+ambiguity_checker = AmbiguityChecker()
+oxymoron_checker = OxymoronChecker()
+cross_message_checker = CrossMessageContradictionChecker()
+
+# Sessions whose analysis state is kept between requests (least recently used are dropped)
+MAX_CACHED_SESSIONS = 256
+
+
+class SessionAnalysisState:
+    """
+    The accumulated graph of a session plus the checkers' running indexes, so a
+    new message only costs the work for its own nodes and edges instead of
+    reloading and rechecking the whole conversation.
+    Nodes and edges are merged exactly as storage.get_accumulated_graph() does.
+    """
+    def __init__(self):
+        self.message_count = 0
+        self.nodes: List[Node] = []
+        self.edges: List[Edge] = []
+        self.node_ids_seen: Set[str] = set()
+        self.edge_ids_seen: Set[str] = set()
+        
+        self.continuity_index = ContinuityIndex()
+        self.ambiguity_index = AmbiguityIndex()
+        self.cross_message_index = CrossMessageIndex()
+        self.oxymoron_diagnostics: List[Diagnostic] = []
+        self.ambiguity_diagnostics: List[Diagnostic] = []
+        self.cross_message_diagnostics: List[Diagnostic] = []
+        self.continuity_diagnostics: list = []
+
+    def add_message(self, graph: Optional[MeaningGraph]):
+        """Merge one message's graph (None if it has no stored graph) and update the checks."""
+        self.message_count += 1
+        if graph is None:
+            return
+        
+        # Add nodes and edges (dedupe by ID)
+        new_nodes = []
+        for node in graph.nodes:
+            if node.id not in self.node_ids_seen:
+                new_nodes.append(node)
+                self.node_ids_seen.add(node.id)
+        new_edges = []
+        for edge in graph.edges:
+            edge_id = f"{edge.source}-{edge.role}-{edge.target}"
+            if edge_id not in self.edge_ids_seen:
+                new_edges.append(edge)
+                self.edge_ids_seen.add(edge_id)
+        self.nodes.extend(new_nodes)
+        self.edges.extend(new_edges)
+        
+        # The accumulated graph carries no assertions, and neither does its new slice
+        new_slice = MeaningGraph.model_construct(nodes=new_nodes, edges=new_edges)
+        
+        # Check for contradictions across the entire conversation
+        # (the oxymoron and cross-message checkers share one tokenization of the labels)
+        label_tokens = tokenize_labels(new_slice)
+        self.continuity_diagnostics.extend(
+            continuity_checker.check_incremental(new_slice, new_slice, self.continuity_index)
+        )
+        self.oxymoron_diagnostics.extend(oxymoron_checker.check(new_slice, label_tokens))
+        # These two can change for earlier messages too, so they are replaced rather than extended
+        self.ambiguity_diagnostics = ambiguity_checker.check_incremental(new_slice, self.ambiguity_index)
+        self.cross_message_diagnostics = cross_message_checker.check_incremental(
+            new_slice, self.cross_message_index, label_tokens
+        )
+
+    def diagnostics(self) -> list:
+        return (
+            self.continuity_diagnostics + 
+            self.ambiguity_diagnostics + 
+            self.oxymoron_diagnostics +
+            self.cross_message_diagnostics
+        )
+
+    def graph(self) -> MeaningGraph:
+        return MeaningGraph.model_construct(nodes=list(self.nodes), edges=list(self.edges))
+
+
+_session_states: "OrderedDict[str, SessionAnalysisState]" = OrderedDict()
+
+
+def _get_session_state(session_id: str, message_count: int) -> SessionAnalysisState:
+    """
+    Cached analysis state for a session that already has `message_count` messages.
+    Rebuilt from storage when missing or out of step with the stored history
+    (e.g. after a restart, or messages added by another worker).
+    """
+    state = _session_states.get(session_id)
+    if state is None or state.message_count != message_count:
+        state = SessionAnalysisState()
+        for msg in storage.get_session_messages(session_id):
+            state.add_message(storage.get_graph(msg["doc_id"]) if msg["doc_id"] else None)
+        _session_states[session_id] = state
+    _session_states.move_to_end(session_id)
+    while len(_session_states) > MAX_CACHED_SESSIONS:
+        _session_states.popitem(last=False)
+    return state
+
 
 class AnalyzeMessageRequest(BaseModel):
     text: str
     lang: str = "en"
 
 
-@router.post("/{session_id}/messages")
+class AnalyzeMessageResponse(BaseModel):
+    message_id: str
+    session_id: str
+    graph: MeaningGraph
+    diagnostics: List[Diagnostic]
+    message_count: int
+
+
+class AccumulatedGraphResponse(BaseModel):
+    session_id: str
+    graph: MeaningGraph
+    node_count: int
+    edge_count: int
+    diagnostic_count: int
+
+
+# Routes return models rather than model_dump() dicts, so the graph is serialized to JSON in one pass
+@router.post("/{session_id}/messages", response_model=AnalyzeMessageResponse)
 async def analyze_session_message(session_id: str, request: AnalyzeMessageRequest):
     """
     Analyze a message in the context of the session history.
@@ -39,77 +160,66 @@ async def analyze_session_message(session_id: str, request: AnalyzeMessageReques
     5. Return diagnostics from accumulated view
     """
     
-    # Verify session exists
-    session_meta = storage.get_session_metadata(session_id)
-    if not session_meta:
+    # Verify session exists (the document alone is enough; metadata would load its graph)
+    if not storage.get_document(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Analyze the new message
+    # Run pipeline on new message
+    # (on a worker thread, so other requests are served while it parses)
+    pipeline = get_pipeline()
+    new_graph = await asyncio.to_thread(pipeline.process, request.text, request.lang)
+    
+    # Everything below runs without awaiting, so concurrent messages to the same
+    # session can't interleave between numbering the message and recording it
+    # The session's cached state already holds the earlier messages (only rebuilt
+    # from storage if it is out of step), so only their count is read here
+    message_count = storage.count_session_messages(session_id)
+    state = _get_session_state(session_id, message_count)
+    
     doc_response = storage.save_document(
-        doc_id=f"msg_{session_id}_{len(storage.get_session_messages(session_id))}",
+        doc_id=f"msg_{session_id}_{message_count}",
         text=request.text,
         lang=request.lang
     )
-    
-    # Run pipeline on new message
-    pipeline = get_pipeline()
-    new_graph = pipeline.process(request.text, request.lang)
     storage.save_graph(doc_response.id, new_graph)
     
     # Add message to session history
     storage.add_session_message(session_id, request.text, doc_response.id)
     
-    # Get accumulated graph (all messages so far)
-    accumulated_graph = storage.get_accumulated_graph(session_id)
-    
-    if not accumulated_graph:
-        # Fallback to just the new message
-        accumulated_graph = new_graph
-    
-    # Run checkers on ACCUMULATED graph (this is the key!)
-    continuity_checker = ContinuityChecker()
-    ambiguity_checker = AmbiguityChecker()
-    oxymoron_checker = OxymoronChecker()
-    cross_message_checker = CrossMessageContradictionChecker()
-    
-    # Check for contradictions across the entire conversation
-    continuity_diagnostics = continuity_checker.check(accumulated_graph)
-    ambiguity_diagnostics = ambiguity_checker.check(accumulated_graph)
-    oxymoron_diagnostics = oxymoron_checker.check(accumulated_graph)
-    cross_message_diagnostics = cross_message_checker.check(accumulated_graph)
+    # Get accumulated graph (all messages so far) and run checkers on it (this is the key!)
+    # Only the new message's nodes and edges are merged and checked here
+    state.add_message(new_graph)
+    accumulated_graph = state.graph()
     
     # Combine all diagnostics
-    all_diagnostics = (
-        continuity_diagnostics + 
-        ambiguity_diagnostics + 
-        oxymoron_diagnostics +
-        cross_message_diagnostics
-    )
+    all_diagnostics = state.diagnostics()
     
     # Update accumulated graph with diagnostics
     accumulated_graph.diagnostics = all_diagnostics
     
-    return {
-        "message_id": doc_response.id,
-        "session_id": session_id,
-        "graph": accumulated_graph.dict(),
-        "diagnostics": [d.dict() for d in all_diagnostics],
-        "message_count": len(storage.get_session_messages(session_id))
-    }
+    return AnalyzeMessageResponse(
+        message_id=doc_response.id,
+        session_id=session_id,
+        graph=accumulated_graph,
+        diagnostics=all_diagnostics,
+        message_count=message_count + 1
+    )
 
 
 @router.get("/{session_id}/messages")
-async def get_session_messages(session_id: str):
-    """Get all messages in a session."""
-    messages = storage.get_session_messages(session_id)
+async def get_session_messages(session_id: str, limit: Optional[int] = None, offset: int = 0):
+    """Get the messages in a session (all of them, or a page with `limit`/`offset`)."""
+    messages = storage.get_session_messages(session_id, limit=limit, offset=offset)
+    paginated = limit is not None or offset > 0
     return {
         "session_id": session_id,
-        "message_count": len(messages),
+        # Always the session's total, also when only a page of messages is returned
+        "message_count": storage.count_session_messages(session_id) if paginated else len(messages),
         "messages": messages
     }
 
 
-@router.get("/{session_id}/accumulated-graph")
+@router.get("/{session_id}/accumulated-graph", response_model=AccumulatedGraphResponse)
 async def get_session_accumulated_graph(session_id: str):
     """Get the full accumulated graph for a session."""
     graph = storage.get_accumulated_graph(session_id)
@@ -117,10 +227,10 @@ async def get_session_accumulated_graph(session_id: str):
     if not graph:
         raise HTTPException(status_code=404, detail="No messages in session")
     
-    return {
-        "session_id": session_id,
-        "graph": graph.dict(),
-        "node_count": len(graph.nodes),
-        "edge_count": len(graph.edges),
-        "diagnostic_count": len(graph.diagnostics)
-    }
+    return AccumulatedGraphResponse(
+        session_id=session_id,
+        graph=graph,
+        node_count=len(graph.nodes),
+        edge_count=len(graph.edges),
+        diagnostic_count=len(graph.diagnostics)
+    )
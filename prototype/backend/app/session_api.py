@@ -4,31 +4,54 @@ Provides CRUD operations and export functionality for sessions.
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi.responses import Response, StreamingResponse
+from typing import Dict, List, Optional
+import orjson
 import uuid
-import json
+from collections import defaultdict
 from datetime import datetime
 
-from app.session_models import SessionMetadata, CreateSessionRequest, UpdateSessionRequest, ExportFormat
-from app.storage import get_storage
-from app.models import MeaningGraph
+from app.session_models import SessionMetadata, CreateSessionRequest, UpdateSessionRequest, ExportFormat, SessionExport
+from app.storage import get_storage, encode_cursor, page_size
+from app.models import MeaningGraph, NodeType, EdgeRole
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 storage = get_storage()
 
 
+def _list_page(limit: int, offset: int, after: Optional[str]) -> List[Dict]:
+    try:
+        # One query for the whole page rather than a metadata lookup per session
+        return storage.list_session_rows(limit=limit, offset=offset, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("", response_model=List[SessionMetadata])
-async def list_sessions(limit: int = 100, offset: int = 0):
-    """List all sessions with metadata."""
-    docs = storage.list_documents(limit=limit, offset=offset)
+async def list_sessions(limit: int = 100, offset: int = 0, after: Optional[str] = None):
+    """
+    List all sessions with metadata, newest first (at most 100 per page).
+    When the page is full, the X-Next-Cursor header holds the `after` value for the next page.
+    """
+    sessions = _list_page(limit, offset, after)
+    headers = {}
+    if sessions and len(sessions) == page_size(limit):
+        last = sessions[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+    # Rows already have SessionMetadata's shape; returning a response skips re-validating each one
+    return Response(orjson.dumps(sessions), media_type="application/json", headers=headers)
+
+
+@router.get("/stream")
+async def stream_sessions(limit: int = 100, offset: int = 0, after: Optional[str] = None):
+    """List sessions as newline-delimited JSON, one SessionMetadata per line."""
+    sessions = _list_page(limit, offset, after)
     
-    sessions = []
-    for doc in docs:
-        metadata = storage.get_session_metadata(doc.id)
-        if metadata:
-            sessions.append(metadata)
+    def lines():
+        for row in sessions:
+            yield orjson.dumps(row) + b"\n"
     
-    return sessions
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.post("", response_model=SessionMetadata)
@@ -77,17 +100,16 @@ async def delete_session(session_id: str):
 async def export_session(session_id: str, format: str = "json"):
     """Export session as JSON or Markdown."""
     doc = storage.get_document(session_id)
-    graph = storage.get_graph(session_id)
-    
     if not doc:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    # The graph is loaded once and handed to whichever format renders it
+    graph = storage.get_graph(session_id)
+    
     if format == "json":
-        return {
-            "session_id": session_id,
-            "document": doc.dict(),
-            "graph": graph.dict() if graph else None
-        }
+        # pydantic-core writes the JSON directly; model_dump() dicts would be walked again by the encoder
+        export = SessionExport(session_id=session_id, document=doc, graph=graph)
+        return Response(export.model_dump_json(), media_type="application/json")
     
     elif format == "markdown":
         return _export_markdown(session_id, doc, graph)
@@ -98,164 +120,194 @@ async def export_session(session_id: str, format: str = "json"):
 
 def _export_markdown(session_id: str, doc, graph: MeaningGraph) -> dict:
     """Generate enhanced Markdown export with hierarchy and edges."""
+    # Each item is written as one f-string, and repeated items go in through
+    # a single extend(), rather than several append() calls per node/edge
     lines = []
     
+    # Bind the graph's lists once; the sections below walk them in tight loops
+    if graph:
+        nodes, edges, diagnostics = graph.nodes, graph.edges, graph.diagnostics
+    
     # Header with metadata
-    lines.append(f"# Session Export: {session_id}\n\n")
-    lines.append("## Metadata\n\n")
-    lines.append(f"- **Session ID**: `{session_id}`\n")
-    lines.append(f"- **Created**: {doc.created_at}\n")
-    lines.append(f"- **Language**: {doc.lang}\n")
+    lines.append(
+        f"# Session Export: {session_id}\n\n"
+        "## Metadata\n\n"
+        f"- **Session ID**: `{session_id}`\n"
+        f"- **Created**: {doc.created_at}\n"
+        f"- **Language**: {doc.lang}\n"
+    )
     if graph:
-        lines.append(f"- **Nodes**: {len(graph.nodes)}\n")
-        lines.append(f"- **Edges**: {len(graph.edges)}\n")
-        lines.append(f"- **Diagnostics**: {len(graph.diagnostics)}\n")
+        lines.append(
+            f"- **Nodes**: {len(nodes)}\n"
+            f"- **Edges**: {len(edges)}\n"
+            f"- **Diagnostics**: {len(diagnostics)}\n"
+        )
     lines.append("\n---\n\n")
     
     # Original Text
-    lines.append("## Original Text\n\n")
-    lines.append(f"> {doc.text}\n\n")
-    lines.append("---\n\n")
+    lines.append(f"## Original Text\n\n> {doc.text}\n\n---\n\n")
     
     if graph:
         # Hierarchical Structure: Goals → Events → Entities
         lines.append("## Meaning Graph\n\n")
         
+        # Sort nodes and edges into their sections in one pass each, and index
+        # them so the sections below never rescan the graph per node or edge
+        goals, events, entities, claims = [], [], [], []
+        nodes_by_id = {}  # first node wins, like a front-to-back search
+        nodes_by_type = {
+            NodeType.GOAL: goals,
+            NodeType.EVENT: events,
+            NodeType.ENTITY: entities,
+            NodeType.CLAIM: claims,
+        }
+        for n in nodes:
+            nodes_by_id.setdefault(n.id, n)
+            bucket = nodes_by_type.get(n.type)
+            if bucket is not None:
+                bucket.append(n)
+        
+        cause_edges, sequence_edges, contrast_edges = [], [], []
+        edges_by_role = {
+            EdgeRole.CAUSE: cause_edges,
+            EdgeRole.SEQUENCE: sequence_edges,
+            EdgeRole.CONTRAST: contrast_edges,
+        }
+        # Edges leaving / entering / touching each node, in graph order
+        edges_by_source = defaultdict(list)
+        edges_by_target = defaultdict(list)
+        edges_by_node = defaultdict(list)
+        for e in edges:
+            bucket = edges_by_role.get(e.role)
+            if bucket is not None:
+                bucket.append(e)
+            edges_by_source[e.source].append(e)
+            edges_by_target[e.target].append(e)
+            edges_by_node[e.source].append(e)
+            if e.target != e.source:
+                edges_by_node[e.target].append(e)
+        
         # 1. Goals (Top Level)
-        goals = [n for n in graph.nodes if n.type == "Goal"]
         if goals:
             lines.append("### 🎯 Goals\n\n")
             for goal in goals:
-                lines.append(f"**{goal.label}**\n")
-                lines.append(f"- ID: `{goal.id}`\n")
+                lines.append(f"**{goal.label}**\n- ID: `{goal.id}`\n")
                 
                 # Find events linked to this goal
                 goal_events = []
-                for edge in graph.edges:
-                    if edge.source == goal.id or edge.target == goal.id:
-                        # Find the connected node
-                        connected_id = edge.target if edge.source == goal.id else edge.source
-                        connected_node = next((n for n in graph.nodes if n.id == connected_id), None)
-                        if connected_node and connected_node.type == "Event":
-                            goal_events.append((edge.role, connected_node))
+                for edge in edges_by_node.get(goal.id, ()):
+                    # Find the connected node
+                    connected_id = edge.target if edge.source == goal.id else edge.source
+                    connected_node = nodes_by_id.get(connected_id)
+                    if connected_node and connected_node.type == "Event":
+                        goal_events.append((edge.role, connected_node))
                 
                 if goal_events:
-                    lines.append(f"- **Related Events**:\n")
-                    for role, event in goal_events:
-                        lines.append(f"  - ({role}) → {event.label}\n")
+                    lines.append("- **Related Events**:\n")
+                    lines.extend(f"  - ({role}) → {event.label}\n" for role, event in goal_events)
                 
                 lines.append("\n")
         
         # 2. Events (Mid Level)
-        events = [n for n in graph.nodes if n.type == "Event"]
         if events:
             lines.append("### ⚡ Events\n\n")
             for event in events:
-                lines.append(f"**{event.label}**\n")
-                lines.append(f"- ID: `{event.id}`\n")
+                lines.append(f"**{event.label}**\n- ID: `{event.id}`\n")
                 
                 # Event properties
-                if hasattr(event, 'properties') and event.properties:
-                    if event.properties.get('modality'):
-                        lines.append(f"- Modality: *{event.properties['modality']}*\n")
-                    if event.properties.get('polarity'):
-                        lines.append(f"- Polarity: *{event.properties['polarity']}*\n")
+                properties = getattr(event, 'properties', None)
+                if properties:
+                    modality = properties.get('modality')
+                    if modality:
+                        lines.append(f"- Modality: *{modality}*\n")
+                    polarity = properties.get('polarity')
+                    if polarity:
+                        lines.append(f"- Polarity: *{polarity}*\n")
                 
                 # Find entities and relationships
                 event_entities = []
-                for edge in graph.edges:
-                    if edge.source == event.id:
-                        target_node = next((n for n in graph.nodes if n.id == edge.target), None)
-                        if target_node and target_node.type == "Entity":
-                            event_entities.append((edge.role, target_node))
+                for edge in edges_by_source.get(event.id, ()):
+                    target_node = nodes_by_id.get(edge.target)
+                    if target_node and target_node.type == "Entity":
+                        event_entities.append((edge.role, target_node))
                 
                 if event_entities:
-                    lines.append(f"- **Participants**:\n")
-                    for role, entity in event_entities:
-                        lines.append(f"  - {role}: {entity.label}\n")
+                    lines.append("- **Participants**:\n")
+                    lines.extend(f"  - {role}: {entity.label}\n" for role, entity in event_entities)
                 
                 lines.append("\n")
         
         # 3. Entities (Detail Level)
-        entities = [n for n in graph.nodes if n.type == "Entity"]
         if entities:
             lines.append("### 👤 Entities\n\n")
             for entity in entities:
-                lines.append(f"- **{entity.label}** (`{entity.id}`)")
-                
                 # Show what events this entity participates in
-                participates_in = []
-                for edge in graph.edges:
-                    if edge.target == entity.id:
-                        source_node = next((n for n in graph.nodes if n.id == edge.source), None)
-                        if source_node and source_node.type == "Event":
-                            participates_in.append((edge.role, source_node))
+                participates_in = 0
+                for edge in edges_by_target.get(entity.id, ()):
+                    source_node = nodes_by_id.get(edge.source)
+                    if source_node and source_node.type == "Event":
+                        participates_in += 1
                 
                 if participates_in:
-                    lines.append(f" - appears in {len(participates_in)} event(s)")
-                
-                lines.append("\n")
+                    lines.append(f"- **{entity.label}** (`{entity.id}`) - appears in {participates_in} event(s)\n")
+                else:
+                    lines.append(f"- **{entity.label}** (`{entity.id}`)\n")
         
         # 4. Claims (if any)
   
-        claims = [n for n in graph.nodes if n.type == "Claim"]
         if claims:
             lines.append("### 💭 Claims\n\n")
-            for claim in claims:
-                lines.append(f"- **{claim.label}** (`{claim.id}`)\n")
+            lines.extend(f"- **{claim.label}** (`{claim.id}`)\n" for claim in claims)
         
         # 5. Key Relationships (Sample of important edges)
         lines.append("### 🔗 Key Relationships\n\n")
         
-        # Group edges by type
-        cause_edges = [e for e in graph.edges if e.role == "Cause"]
-        sequence_edges = [e for e in graph.edges if e.role == "Sequence"]
-        contrast_edges = [e for e in graph.edges if e.role == "Contrast"]
-        
         if cause_edges:
             lines.append("**Causal:**\n")
             for edge in cause_edges[:5]:  # Limit to 5
-                source = next((n for n in graph.nodes if n.id == edge.source), None)
-                target = next((n for n in graph.nodes if n.id == edge.target), None)
+                source = nodes_by_id.get(edge.source)
+                target = nodes_by_id.get(edge.target)
                 if source and target:
                     lines.append(f"- {source.label} → causes → {target.label}\n")
         
         if sequence_edges:
             lines.append("\n**Sequential:**\n")
             for edge in sequence_edges[:5]:
-                source = next((n for n in graph.nodes if n.id == edge.source), None)
-                target = next((n for n in graph.nodes if n.id == edge.target), None)
+                source = nodes_by_id.get(edge.source)
+                target = nodes_by_id.get(edge.target)
                 if source and target:
                     lines.append(f"- {source.label} → then → {target.label}\n")
         
         if contrast_edges:
             lines.append("\n**Contrasts:**\n")
             for edge in contrast_edges[:5]:
-                source = next((n for n in graph.nodes if n.id == edge.source), None)
-                target = next((n for n in graph.nodes if n.id == edge.target), None)
+                source = nodes_by_id.get(edge.source)
+                target = nodes_by_id.get(edge.target)
                 if source and target:
                     lines.append(f"- {source.label} ⚡ contrasts with ⚡ {target.label}\n")
         
         lines.append("\n")
         
         # 6. Diagnostics
-        if graph.diagnostics:
+        if diagnostics:
             lines.append("### ⚠️ Diagnostics\n\n")
             
-            # Group by kind
-            warnings = [d for d in graph.diagnostics if d.severity == "warning"]
-            errors = [d for d in graph.diagnostics if d.severity == "error"]
+            # Group by severity in one pass
+            warnings, errors = [], []
+            for d in diagnostics:
+                if d.severity == "warning":
+                    warnings.append(d)
+                elif d.severity == "error":
+                    errors.append(d)
             
             if errors:
                 lines.append("**Errors:**\n")
-                for diag in errors:
-                    lines.append(f"- [{diag.kind}] {diag.message}\n")
+                lines.extend(f"- [{diag.kind}] {diag.message}\n" for diag in errors)
                 lines.append("\n")
             
             if warnings:
                 lines.append("**Warnings:**\n")
-                for diag in warnings:
-                    lines.append(f"- [{diag.kind}] {diag.message}\n")
+                lines.extend(f"- [{diag.kind}] {diag.message}\n" for diag in warnings)
                 lines.append("\n")
     
     markdown_content = "".join(lines)
@@ -6,6 +6,7 @@ Extends the storage layer with session-specific functionality.
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.models import DocResponse, MeaningGraph
 
 
 class SessionMetadata(BaseModel):
@@ -31,6 +32,13 @@ class UpdateSessionRequest(BaseModel):
     name: Optional[str] = None
 
 
+class SessionExport(BaseModel):
+    """JSON export of a session: its document and meaning graph (if analyzed)."""
+    session_id: str
+    document: DocResponse
+    graph: Optional[MeaningGraph] = None
+
+
 class ExportFormat(BaseModel):
     """Export format options."""
     format: str = "json"  # "json" or "markdown"
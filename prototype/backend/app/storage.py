@@ -6,10 +6,64 @@ Default implementation uses SQLite for local-first persistence.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from collections import OrderedDict
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
 from app.models import MeaningGraph, DocResponse
 from datetime import datetime
 
+# Largest page the listing queries return, whatever limit is asked for
+MAX_PAGE_SIZE = 100
+
+
+def page_size(limit: int) -> int:
+    """Rows a listing returns for `limit`: at most MAX_PAGE_SIZE, and never a negative
+    LIMIT (which SQLite reads as "no limit")."""
+    return max(0, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(created_at: str, doc_id: str) -> str:
+    """Opaque position after a listed document, for keyset pagination."""
+    return f"{created_at}|{doc_id}"
+
+
+def decode_cursor(cursor: str):
+    """Inverse of encode_cursor(). Raises ValueError for a malformed cursor."""
+    created_at, sep, doc_id = cursor.partition("|")
+    if not sep or not created_at or not doc_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, doc_id
+
+
+# Level 1 already shrinks graph JSON ~3x; higher levels gain little and cost more per save
+GRAPH_COMPRESSION_LEVEL = 1
+
+_GRAPHS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        doc_id TEXT PRIMARY KEY,
+        graph_blob BLOB NOT NULL,
+        updated_at TEXT NOT NULL,
+        node_count INTEGER NOT NULL DEFAULT 0,
+        edge_count INTEGER NOT NULL DEFAULT 0,
+        diagnostic_count INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (doc_id) REFERENCES documents(id) ON DELETE CASCADE
+    )
+"""
+
+
+def _pack_graph(graph: MeaningGraph) -> bytes:
+    """zlib-compressed graph JSON, as stored in graphs.graph_blob."""
+    return zlib.compress(graph.model_dump_json().encode(), GRAPH_COMPRESSION_LEVEL)
+
+
+def _unpack_graph(data) -> MeaningGraph:
+    """Inverse of _pack_graph(). Rows migrated from the old TEXT column still hold plain JSON."""
+    if isinstance(data, bytes):
+        data = zlib.decompress(data)
+    return MeaningGraph.model_validate_json(data)
+
 
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
@@ -19,6 +73,10 @@ class StorageBackend(ABC):
         """Save a document and return metadata."""
         pass
     
+    def save_documents(self, docs: Sequence[Tuple[str, str, str]]) -> List[DocResponse]:
+        """Save several (doc_id, text, lang) documents. Backends may do this in one write."""
+        return [self.save_document(doc_id, text, lang) for doc_id, text, lang in docs]
+    
     @abstractmethod
     def get_document(self, doc_id: str) -> Optional[DocResponse]:
         """Retrieve document metadata by ID."""
@@ -39,6 +97,14 @@ class StorageBackend(ABC):
         """Retrieve a meaning graph by document ID."""
         pass
     
+    def get_graph_version(self, doc_id: str) -> Optional[str]:
+        """
+        A token that changes whenever the document's graph is saved, without loading
+        the graph (used as its HTTP ETag). None if there is no graph, or if the
+        backend doesn't track versions.
+        """
+        return None
+    
     @abstractmethod
     def list_documents(self, limit: int = 100, offset: int = 0) -> List[DocResponse]:
         """List all documents with pagination."""
@@ -49,11 +115,22 @@ class InMemoryStorage(StorageBackend):
     """
     Simple in-memory storage (original implementation).
     Data is lost on restart. Useful for testing.
+    Bounded LRU: once `max_docs` is exceeded the least recently used
+    documents (and their graphs) are evicted.
     """
     
-    def __init__(self):
-        self.docs: Dict[str, Dict] = {}
-        self.graphs: Dict[str, Dict] = {}
+    def __init__(self, max_docs: int = 4096):
+        self.max_docs = max_docs
+        self.docs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.graphs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _evict(self):
+        while len(self.docs) > self.max_docs:
+            doc_id, _ = self.docs.popitem(last=False)
+            self.graphs.pop(doc_id, None)
+        while len(self.graphs) > self.max_docs:
+            self.graphs.popitem(last=False)
     
     def save_document(self, doc_id: str, text: str, lang: str) -> DocResponse:
         doc = {
@@ -62,29 +139,46 @@ class InMemoryStorage(StorageBackend):
             "lang": lang,
             "created_at": datetime.utcnow().isoformat()
         }
-        self.docs[doc_id] = doc
+        with self._lock:
+            self.docs[doc_id] = doc
+            self.docs.move_to_end(doc_id)
+            self._evict()
         return DocResponse(**doc)
     
     def get_document(self, doc_id: str) -> Optional[DocResponse]:
-        doc = self.docs.get(doc_id)
+        with self._lock:
+            doc = self.docs.get(doc_id)
+            if doc:
+                self.docs.move_to_end(doc_id)
         return DocResponse(**doc) if doc else None
     
     def delete_document(self, doc_id: str) -> bool:
-        existed = doc_id in self.docs
-        self.docs.pop(doc_id, None)
-        self.graphs.pop(doc_id, None)
+        with self._lock:
+            existed = doc_id in self.docs
+            self.docs.pop(doc_id, None)
+            self.graphs.pop(doc_id, None)
         return existed
     
     def save_graph(self, doc_id: str, graph: MeaningGraph) -> None:
-        self.graphs[doc_id] = graph.dict()
+        graph_dict = graph.model_dump()
+        with self._lock:
+            self.graphs[doc_id] = graph_dict
+            self.graphs.move_to_end(doc_id)
+            self._evict()
     
     def get_graph(self, doc_id: str) -> Optional[MeaningGraph]:
-        graph_dict = self.graphs.get(doc_id)
-        return MeaningGraph(**graph_dict) if graph_dict else None
+        with self._lock:
+            graph_dict = self.graphs.get(doc_id)
+            if graph_dict:
+                self.graphs.move_to_end(doc_id)
+        return MeaningGraph.model_validate(graph_dict) if graph_dict else None
     
     def list_documents(self, limit: int = 100, offset: int = 0) -> List[DocResponse]:
-        all_docs = list(self.docs.values())
-        paginated = all_docs[offset:offset + limit]
+        with self._lock:
+            all_docs = list(self.docs.values())
+        # Same page cap as SQLiteStorage; a negative offset counts as 0, like SQL OFFSET
+        offset = max(0, offset)
+        paginated = all_docs[offset:offset + page_size(limit)]
         return [DocResponse(**doc) for doc in paginated]
 
 
@@ -92,17 +186,77 @@ class SQLiteStorage(StorageBackend):
     """
     SQLite-based persistent storage.
     Stores documents and graphs locally in a single .db file.
+    
+    Parsed documents and graphs are kept in a per-process LRU, keyed by ID and
+    checked against the row's timestamp on every read, so a row rewritten by
+    another process is parsed again. Cached objects are shared between callers
+    and must not be mutated.
+    
+    Each thread gets its own connection, opened on first use, so storage can be
+    called from worker threads as well as the event loop. (With ":memory:" that
+    would mean a separate database per thread; use InMemoryStorage instead.)
     """
     
+    CACHE_SIZE = 256
+    
     def __init__(self, db_path: str = "lide.db"):
-        import sqlite3
-        import json
-        
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row  # Return dict-like rows
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._doc_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._graph_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._init_schema()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection; a sqlite3 connection must not be used by two threads at once."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can close it from another thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row  # Return dict-like rows
+            self._configure_connection(conn)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Tune the connection for a read-heavy workload whose data fits in memory."""
+        # WAL lets reads run while a write commits, and with synchronous=NORMAL
+        # commits no longer fsync (only checkpoints do); both persist in the file
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Read pages through a 256 MiB memory map instead of read() calls,
+        # and keep up to ~64 MB of pages cached
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+    
+    def _cache_get(self, cache: OrderedDict, doc_id: str, stamp: str):
+        """The cached value for doc_id if it was parsed from the row version `stamp`."""
+        with self._cache_lock:
+            entry = cache.get(doc_id)
+            if entry is None or entry[0] != stamp:
+                return None
+            cache.move_to_end(doc_id)
+            return entry[1]
+    
+    def _cache_put(self, cache: OrderedDict, doc_id: str, stamp: str, value) -> None:
+        with self._cache_lock:
+            cache[doc_id] = (stamp, value)
+            cache.move_to_end(doc_id)
+            while len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
+    
+    def _cache_discard(self, doc_id: str) -> None:
+        with self._cache_lock:
+            self._doc_cache.pop(doc_id, None)
+            self._graph_cache.pop(doc_id, None)
+    
     def _init_schema(self):
         """Create tables if they don't exist."""
         cursor = self.conn.cursor()
@@ -117,15 +271,27 @@ class SQLiteStorage(StorageBackend):
             )
         """)
         
-        # Graphs table (stores JSON blob)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS graphs (
-                doc_id TEXT PRIMARY KEY,
-                graph_json TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
-                FOREIGN KEY (doc_id) REFERENCES documents(id) ON DELETE CASCADE
-            )
-        """)
+        # Graphs table (stores compressed JSON blob)
+        cursor.execute(_GRAPHS_TABLE.format(name="graphs"))
+        
+        # Databases from before graph_blob store plain JSON in a TEXT graph_json column.
+        # SQLite can't change a column's type, so the table is rebuilt once; the JSON is
+        # copied as-is (and read back as such) and gets compressed the next time it is saved
+        columns = {row["name"] for row in cursor.execute("PRAGMA table_info(graphs)")}
+        if "graph_blob" not in columns:
+            cursor.execute("DROP TABLE IF EXISTS graphs_migrated")
+            cursor.execute(_GRAPHS_TABLE.format(name="graphs_migrated"))
+            cursor.execute("""
+                INSERT INTO graphs_migrated
+                    (doc_id, graph_blob, updated_at, node_count, edge_count, diagnostic_count)
+                SELECT doc_id, graph_json, updated_at,
+                       COALESCE(json_array_length(graph_json, '$.nodes'), 0),
+                       COALESCE(json_array_length(graph_json, '$.edges'), 0),
+                       COALESCE(json_array_length(graph_json, '$.diagnostics'), 0)
+                FROM graphs
+            """)
+            cursor.execute("DROP TABLE graphs")
+            cursor.execute("ALTER TABLE graphs_migrated RENAME TO graphs")
         
         # Session messages table - NEW for session-aware analysis
         cursor.execute("""
@@ -140,6 +306,12 @@ class SQLiteStorage(StorageBackend):
             )
         """)
         
+        # Index for listing documents newest first (scanned backwards) without a sort
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_documents_created
+            ON documents(created_at, id)
+        """)
+        
         # Index for efficient session message retrieval
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_session_messages_session 
@@ -149,72 +321,115 @@ class SQLiteStorage(StorageBackend):
         self.conn.commit()
     
     def save_document(self, doc_id: str, text: str, lang: str) -> DocResponse:
-        import json
-        
         created_at = datetime.utcnow().isoformat()
         
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO documents (id, text, lang, created_at)
-            VALUES (?, ?, ?, ?)
-        """, (doc_id, text, lang, created_at))
-        self.conn.commit()
+        # The connection as a context manager commits (or rolls back) the transaction
+        with self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO documents (id, text, lang, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (doc_id, text, lang, created_at))
+        self._cache_discard(doc_id)
         
         return DocResponse(id=doc_id, text=text, lang=lang, created_at=created_at)
     
+    def save_documents(self, docs: Sequence[Tuple[str, str, str]]) -> List[DocResponse]:
+        created_at = datetime.utcnow().isoformat()
+        rows = [(doc_id, text, lang, created_at) for doc_id, text, lang in docs]
+        
+        # One statement and one commit for the whole batch
+        with self.conn:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO documents (id, text, lang, created_at)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+        for doc_id, _, _, _ in rows:
+            self._cache_discard(doc_id)
+        
+        return [DocResponse(id=doc_id, text=text, lang=lang, created_at=created_at)
+                for doc_id, text, lang, created_at in rows]
+    
     def get_document(self, doc_id: str) -> Optional[DocResponse]:
         cursor = self.conn.cursor()
+        # Check the row's version first; the text is only read on a cache miss
+        cursor.execute("SELECT created_at FROM documents WHERE id = ?", (doc_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        
+        doc = self._cache_get(self._doc_cache, doc_id, row["created_at"])
+        if doc is not None:
+            return doc
+        
         cursor.execute("SELECT * FROM documents WHERE id = ?", (doc_id,))
         row = cursor.fetchone()
+        if not row:
+            return None
         
-        if row:
-            return DocResponse(
-                id=row["id"],
-                text=row["text"],
-                lang=row["lang"],
-                created_at=row["created_at"]
-            )
-        return None
+        doc = DocResponse(
+            id=row["id"],
+            text=row["text"],
+            lang=row["lang"],
+            created_at=row["created_at"]
+        )
+        self._cache_put(self._doc_cache, doc_id, row["created_at"], doc)
+        return doc
     
     def delete_document(self, doc_id: str) -> bool:
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
-        deleted = cursor.rowcount > 0
-        self.conn.commit()
+        with self.conn:
+            deleted = self.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,)).rowcount > 0
+        self._cache_discard(doc_id)
         return deleted
     
     def save_graph(self, doc_id: str, graph: MeaningGraph) -> None:
-        import json
-        
-        graph_json = json.dumps(graph.dict())
+        graph_blob = _pack_graph(graph)
         updated_at = datetime.utcnow().isoformat()
         
+        # Counts are stored alongside the blob so session listings never have to read it
+        with self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO graphs
+                    (doc_id, graph_blob, updated_at, node_count, edge_count, diagnostic_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (doc_id, graph_blob, updated_at,
+                  len(graph.nodes), len(graph.edges), len(graph.diagnostics)))
+        # Not cached here: the caller still holds (and may keep changing) this instance
+        self._cache_discard(doc_id)
+    
+    def get_graph_version(self, doc_id: str) -> Optional[str]:
         cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO graphs (doc_id, graph_json, updated_at)
-            VALUES (?, ?, ?)
-        """, (doc_id, graph_json, updated_at))
-        self.conn.commit()
+        cursor.execute("SELECT updated_at FROM graphs WHERE doc_id = ?", (doc_id,))
+        row = cursor.fetchone()
+        return row["updated_at"] if row else None
     
     def get_graph(self, doc_id: str) -> Optional[MeaningGraph]:
-        import json
-        
         cursor = self.conn.cursor()
-        cursor.execute("SELECT graph_json FROM graphs WHERE doc_id = ?", (doc_id,))
+        # Check the row's version first; the blob is only read and parsed on a cache miss
+        cursor.execute("SELECT updated_at FROM graphs WHERE doc_id = ?", (doc_id,))
         row = cursor.fetchone()
+        if not row:
+            return None
         
-        if row:
-            graph_dict = json.loads(row["graph_json"])
-            return MeaningGraph(**graph_dict)
-        return None
+        graph = self._cache_get(self._graph_cache, doc_id, row["updated_at"])
+        if graph is not None:
+            return graph
+        
+        cursor.execute("SELECT graph_blob, updated_at FROM graphs WHERE doc_id = ?", (doc_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        
+        graph = _unpack_graph(row["graph_blob"])
+        self._cache_put(self._graph_cache, doc_id, row["updated_at"], graph)
+        return graph
     
     def list_documents(self, limit: int = 100, offset: int = 0) -> List[DocResponse]:
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT * FROM documents
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, id DESC
             LIMIT ? OFFSET ?
-        """, (limit, offset))
+        """, (page_size(limit), offset))
         
         rows = cursor.fetchall()
         return [DocResponse(
@@ -232,60 +447,98 @@ class SQLiteStorage(StorageBackend):
         return doc is not None
     
     def get_session_metadata(self, doc_id: str):
-        """Get enriched metadata for a session."""
-        from app.session_models import SessionMetadata
-        
-        doc = self.get_document(doc_id)
-        graph = self.get_graph(doc_id)
+        """Get enriched metadata for a session, without loading its graph."""
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            {self._SESSION_METADATA_SELECT}
+            WHERE d.id = ?
+        """, (doc_id,))
+        row = cursor.fetchone()
         
-        if not doc:
+        if not row:
             return None
         
-        node_count = len(graph.nodes) if graph else 0
-        edge_count = len(graph.edges) if graph else 0
-        diagnostic_count = len(graph.diagnostics) if graph else 0
+        from app.session_models import SessionMetadata
+        return SessionMetadata(**self._session_row(row))
+    
+    def list_session_rows(self, limit: int = 100, offset: int = 0, after: Optional[str] = None) -> List[Dict]:
+        """
+        Metadata for a page of sessions, newest first, in a single query.
+        Counts come from the graphs table's count columns, so no graph is read.
+        Rows are plain dicts with SessionMetadata's fields; listing endpoints
+        serialize them directly instead of building a model per row.
         
-        return SessionMetadata(
-            id=doc.id,
-            name=doc.id,  # MVP: use ID as name
-            created_at=doc.created_at,
-            updated_at=doc.created_at,  # TODO: track separately
-            node_count=node_count,
-            edge_count=edge_count,
-            diagnostic_count=diagnostic_count
-        )
+        `after` is a cursor (encode_cursor() of the last session of the previous
+        page). Unlike a large offset, it seeks straight to the page via the index.
+        """
+        if after is not None:
+            after_created, after_id = decode_cursor(after)
+            where, params = "WHERE (d.created_at, d.id) < (?, ?)", [after_created, after_id]
+        else:
+            where, params = "", []
+        
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            {self._SESSION_METADATA_SELECT}
+            {where}
+            ORDER BY d.created_at DESC, d.id DESC
+            LIMIT ? OFFSET ?
+        """, (*params, page_size(limit), offset))
+        
+        return [self._session_row(row) for row in cursor.fetchall()]
+    
+    _SESSION_METADATA_SELECT = """
+            SELECT d.id, d.created_at,
+                   COALESCE(g.node_count, 0) AS node_count,
+                   COALESCE(g.edge_count, 0) AS edge_count,
+                   COALESCE(g.diagnostic_count, 0) AS diagnostic_count
+            FROM documents d
+            LEFT JOIN graphs g ON g.doc_id = d.id"""
+    
+    @staticmethod
+    def _session_row(row) -> Dict:
+        return {
+            "id": row["id"],
+            "name": row["id"],  # MVP: use ID as name
+            "created_at": row["created_at"],
+            "updated_at": row["created_at"],  # TODO: track separately
+            "node_count": row["node_count"],
+            "edge_count": row["edge_count"],
+            "diagnostic_count": row["diagnostic_count"]
+        }
     
     def add_session_message(self, session_id: str, message_text: str, doc_id: Optional[str] = None) -> int:
         """Add a message to a session's history. Returns sequence number."""
-        cursor = self.conn.cursor()
-        
-        # Get next sequence number
-        cursor.execute("""
-            SELECT COALESCE(MAX(sequence_num), 0) + 1 
-            FROM session_messages 
-            WHERE session_id = ?
-        """, (session_id,))
-        seq_num = cursor.fetchone()[0]
-        
         created_at = datetime.utcnow().isoformat()
         
-        cursor.execute("""
-            INSERT INTO session_messages (session_id, message_text, doc_id, created_at, sequence_num)
-            VALUES (?, ?, ?, ?, ?)
-        """, (session_id, message_text, doc_id, created_at, seq_num))
+        with self.conn:
+            cursor = self.conn.cursor()
+            
+            # Get next sequence number
+            cursor.execute("""
+                SELECT COALESCE(MAX(sequence_num), 0) + 1 
+                FROM session_messages 
+                WHERE session_id = ?
+            """, (session_id,))
+            seq_num = cursor.fetchone()[0]
+            
+            cursor.execute("""
+                INSERT INTO session_messages (session_id, message_text, doc_id, created_at, sequence_num)
+                VALUES (?, ?, ?, ?, ?)
+            """, (session_id, message_text, doc_id, created_at, seq_num))
         
-        self.conn.commit()
         return seq_num
     
-    def get_session_messages(self, session_id: str):
-        """Get all messages for a session in order."""
+    def get_session_messages(self, session_id: str, limit: Optional[int] = None, offset: int = 0):
+        """Get a session's messages in order (all of them unless `limit` is given)."""
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT message_text, doc_id, created_at, sequence_num
             FROM session_messages
             WHERE session_id = ?
             ORDER BY sequence_num ASC
-        """, (session_id,))
+            LIMIT ? OFFSET ?
+        """, (session_id, -1 if limit is None else limit, offset))
         
         messages = []
         for row in cursor.fetchall():
@@ -297,6 +550,12 @@ class SQLiteStorage(StorageBackend):
             })
         return messages
     
+    def count_session_messages(self, session_id: str) -> int:
+        """Number of messages in a session."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM session_messages WHERE session_id = ?", (session_id,))
+        return cursor.fetchone()[0]
+    
     def get_accumulated_graph(self, session_id: str) -> Optional[MeaningGraph]:
         """Build accumulated graph from all session messages."""
         from app.models import Node, Edge, Diagnostic
@@ -339,8 +598,12 @@ class SQLiteStorage(StorageBackend):
         )
     
     def close(self):
-        """Close the database connection."""
-        self.conn.close()
+        """Close every thread's database connection."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
 
 
 # Singleton storage instance
@@ -362,7 +625,7 @@ def get_storage(backend: str = "sqlite", **kwargs) -> StorageBackend:
     
     if _storage_instance is None:
         if backend == "memory":
-            _storage_instance = InMemoryStorage()
+            _storage_instance = InMemoryStorage(max_docs=kwargs.get("max_docs", 4096))
         elif backend == "sqlite":
             import os
             # Use env var for Docker compatibility, fallback to local path
@@ -1,10 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import router as api_router
+from app.api import router as api_router, register_plugins, warm_pipeline
 from app.session_api import router as session_api_router
 from app.session_analysis import router as session_analysis_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup work lives here rather than in router on_event hooks, which the
+    # installed FastAPI runs a second time when the router is included
+    register_plugins()
+    warm_pipeline()
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Language IDE API",
     description="API for Language IDE - Map-first Meaning Graph System",
     version="0.1.0",
@@ -0,0 +1,52 @@
+import sys
+import os
+import cProfile
+import pstats
+import time
+
+# Add backend directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.agent.session import SessionManager
+from app.agent.interceptor import Interceptor
+
+sentences = [
+    "The building is tall.",
+    "It is short.",
+    "I have blue eyes.",
+    "I have brown eyes.",
+    "Check the file.",
+    "I want to build a fast application.",
+    "The application should be slow.",
+    "I have to build a tall short building.",
+]
+
+def run_session(interceptor: Interceptor, turns: int):
+    session = SessionManager()
+    for i in range(turns):
+        interceptor.check_and_inject(sentences[i % len(sentences)], session)
+    return session
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    interceptor = Interceptor()
+    # Warm up so model loading doesn't dominate the profile
+    run_session(interceptor, len(sentences))
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    session = run_session(interceptor, turns)
+    profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    graph = session.get_graph()
+    print(f"=== {turns} turns in {elapsed:.2f}s ({elapsed / turns * 1000:.1f} ms/turn) ===")
+    print(f"Session graph: {len(graph.nodes)} nodes, {len(graph.edges)} edges, {len(graph.assertions)} assertions\n")
+
+    stats = pstats.Stats(profiler)
+    stats.sort_stats("cumulative").print_stats("app/", 25)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pytest
 from app.pipeline import Pipeline
-from app.models import DiagnosticKind, AmbiguityDimension
+from app.models import DiagnosticKind, AmbiguityDimension, MeaningGraph, Node, Edge, NodeType, EdgeRole
+from app.checkers.ambiguity import AmbiguityChecker, AmbiguityIndex
 
 def test_ambiguity_detection():
     pipeline = Pipeline("en_core_web_sm")
@@ -22,5 +23,26 @@ def test_ambiguity_detection():
     assert any("Literal" in alt.label for alt in alternatives)
     assert any("Figurative" in alt.label for alt in alternatives)
 
+def test_ambiguity_checker_incremental():
+    checker = AmbiguityChecker()
+    index = AmbiguityIndex()
+    
+    turn1 = MeaningGraph(nodes=[
+        Node(id="n1", type=NodeType.ENTITY, label="It"),
+        Node(id="n2", type=NodeType.ENTITY, label="file"),
+    ])
+    assert len(checker.check_incremental(turn1, index)) == 2
+    
+    # A reference edge in a later turn clears the earlier pronoun, as check() on the full graph would
+    turn2 = MeaningGraph(
+        nodes=[Node(id="n3", type=NodeType.ENTITY, label="The building")],
+        edges=[Edge(source="n1", target="n3", role=EdgeRole.SAME_AS)]
+    )
+    diagnostics = checker.check_incremental(turn2, index)
+    full = MeaningGraph(nodes=turn1.nodes + turn2.nodes, edges=turn2.edges)
+    assert [d.message for d in diagnostics] == [d.message for d in checker.check(full)]
+    assert len(diagnostics) == 1
+    assert "file" in diagnostics[0].message
+
 if __name__ == "__main__":
     test_ambiguity_detection()
@@ -1,8 +1,8 @@
 import pytest
 from app.pipeline import Pipeline
-from app.checkers.continuity import ContinuityChecker
-from app.coref import CoreferenceResolver
-from app.models import MeaningGraph, Edge, EdgeRole, Provenance
+from app.checkers.continuity import ContinuityChecker, ContinuityIndex
+from app.coref import CoreferenceResolver, CorefState
+from app.models import MeaningGraph, Node, NodeType, Edge, EdgeRole, Provenance, Assertion
 
 def test_cross_sentence_contradiction():
     """
@@ -66,3 +66,76 @@ def test_cross_sentence_contradiction():
     assert "building" in error.subject or "It" in error.subject
     assert "tall" in error.message
     assert "short" in error.message
+
+def test_conflicts_reported_once_per_distinct_pair():
+    """
+    Repeating a value must not produce extra errors; three distinct values
+    produce one error per pair.
+    """
+    def assertion(obj):
+        return Assertion(subject="building", predicate="be", object=obj, source_event_id="evt")
+    
+    checker = ContinuityChecker()
+    
+    graph = MeaningGraph(assertions=[assertion("tall"), assertion("short"), assertion("short")])
+    errors = checker.check(graph)
+    assert [(e.val1, e.val2) for e in errors] == [("tall", "short")]
+    
+    graph = MeaningGraph(assertions=[assertion("tall"), assertion("short"), assertion("tall"), assertion("wide")])
+    errors = checker.check(graph)
+    assert [(e.val1, e.val2) for e in errors] == [("tall", "short"), ("tall", "wide"), ("short", "wide")]
+    
+    # The incremental check reports the same pairs, each as soon as its second value arrives
+    index = ContinuityIndex()
+    errors = []
+    for obj in ["tall", "short", "tall", "wide"]:
+        turn = MeaningGraph(assertions=[assertion(obj)])
+        errors += checker.check_incremental(turn, turn, index)
+    assert [(e.val1, e.val2) for e in errors] == [("tall", "short"), ("tall", "wide"), ("short", "wide")]
+
+def test_same_as_chains_resolve_to_the_root():
+    """A -> B -> C SameAs chains resolve subjects all the way to C."""
+    nodes = [
+        Node(id="n1", type=NodeType.ENTITY, label="building"),
+        Node(id="n2", type=NodeType.ENTITY, label="it"),
+        Node(id="n3", type=NodeType.ENTITY, label="that"),
+    ]
+    edges = [
+        Edge(source="n3", target="n2", role=EdgeRole.SAME_AS),
+        Edge(source="n2", target="n1", role=EdgeRole.SAME_AS),
+    ]
+    assertions = [
+        Assertion(subject="building", predicate="be", object="tall", source_event_id="evt1"),
+        Assertion(subject="that", predicate="be", object="short", source_event_id="evt2"),
+    ]
+    graph = MeaningGraph(nodes=nodes, edges=edges, assertions=assertions)
+    
+    errors = ContinuityChecker().check(graph)
+    
+    assert len(errors) == 1
+    assert errors[0].subject == "building"
+
+def test_coref_across_turns():
+    """Pronouns link back to earlier turns, whether resolved per turn with a carried state or in one batch."""
+    def turns():
+        return [
+            MeaningGraph(nodes=[Node(id="t1_0", type=NodeType.ENTITY, label="Gregor", properties={"pos": "PROPN", "label": "PERSON"})]),
+            MeaningGraph(nodes=[Node(id="t2_0", type=NodeType.ENTITY, label="building", properties={"pos": "NOUN"})]),
+            MeaningGraph(nodes=[
+                Node(id="t3_0", type=NodeType.ENTITY, label="He"),
+                Node(id="t3_1", type=NodeType.ENTITY, label="it"),
+            ]),
+        ]
+    expected = [("t3_0", "t1_0"), ("t3_1", "t2_0")]
+    
+    batch = CoreferenceResolver().resolve_batch(turns())
+    assert [(e.source, e.target) for e in batch[2].edges] == expected
+    assert not batch[0].edges and not batch[1].edges
+    
+    resolver = CoreferenceResolver()
+    state = CorefState()
+    session = MeaningGraph()
+    for turn in turns():
+        session.nodes.extend(turn.nodes)
+        resolver.resolve(None, session, new_nodes=turn.nodes, state=state)
+    assert [(e.source, e.target) for e in session.edges] == expected
@@ -0,0 +1,33 @@
+from app.logic import LogicEngine
+from app.models import MeaningGraph, Assertion
+
+
+def _engine(*claims):
+    assertions = [
+        Assertion(subject=s, predicate=p, object=o, condition=c, source_event_id=f"evt_{i}")
+        for i, (s, p, o, c) in enumerate(claims)
+    ]
+    return LogicEngine(MeaningGraph(assertions=assertions))
+
+def test_every_conflicting_pair_is_reported():
+    """A third conflicting claim is checked against both earlier ones, not just the first."""
+    engine = _engine(
+        ("Server", "be", "live", None),
+        ("server", "be", "down", None),
+        ("server", "be", "Offline", None),
+    )
+    pairs = [(c["assertion_1"].object, c["assertion_2"].object) for c in engine.find_contradictions()]
+    assert pairs == [("live", "down"), ("live", "Offline"), ("down", "Offline")]
+
+def test_conditions_must_match():
+    """Claims under different conditions don't contradict; claims under the same one do."""
+    engine = _engine(
+        ("I", "stay", "home", None),
+        ("I", "stay", "outside", "if sun"),
+        ("I", "stay", "inside", "if sun"),
+        ("I", "stay", "Home", None),
+        ("I", "stay", None, None),
+    )
+    contradictions = engine.find_contradictions()
+    assert len(contradictions) == 1
+    assert contradictions[0]["reason"] == "Conflicting objects: 'outside' vs 'inside'"
@@ -1,6 +1,7 @@
 import pytest
 from app.pipeline import Pipeline
-from app.models import DiagnosticKind, Severity
+from app.checkers.oxymoron import OxymoronChecker
+from app.models import DiagnosticKind, Severity, MeaningGraph, Node, NodeType
 
 def test_oxymoron_detection_in_pipeline():
     """Test that 'tall short building' is flagged as contradictory"""
@@ -59,5 +60,16 @@ def test_oxymoron_checker_provenance():
         assert len(diag.provenance) > 0, "Provenance should not be empty"
         assert diag.provenance[0].engine_id == "oxymoron-checker"
 
+def test_oxymoron_terms_are_structured():
+    """Test that the contradictory terms are reported as data, in label order"""
+    checker = OxymoronChecker()
+    graph = MeaningGraph(nodes=[Node(id="n1", type=NodeType.ENTITY, label="tall-short building")])
+    
+    diagnostics = checker.check(graph)
+    
+    assert len(diagnostics) == 1
+    assert diagnostics[0].terms == ["tall", "short"]
+    assert "(tall and short)" in diagnostics[0].message
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -29,5 +29,69 @@ def test_pipeline_processing():
     agent_edges = [e for e in graph.edges if e.role == EdgeRole.AGENT]
     assert len(agent_edges) > 0
 
+@pytest.fixture
+def rule_pipeline(monkeypatch):
+    """
+    A Pipeline over a blank English model with rule-based entities and verbs,
+    so batch processing can be tested without a trained model.
+    """
+    import spacy
+    import app.pipeline
+    
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": "Gregor Samsa"},
+        {"label": "PERSON", "pattern": "Mary"},
+    ])
+    nlp.add_pipe("attribute_ruler").add_patterns([
+        {"patterns": [[{"LOWER": word}]], "attrs": {"POS": "VERB", "LEMMA": lemma}}
+        for word, lemma in [("woke", "wake"), ("opened", "open"), ("wants", "want")]
+    ])
+    monkeypatch.setitem(app.pipeline._nlp_cache, "test-rules", nlp)
+    return Pipeline("test-rules")
+
+def _normalized(graph):
+    """Graph JSON with the randomly generated context frame id replaced."""
+    return graph.model_dump_json().replace(graph.context_frames[0].frame_id, "ctx")
+
+def test_process_batch_matches_process(rule_pipeline):
+    items = [
+        ("Gregor Samsa woke.", "doc_1"),
+        ("Mary opened the bank.", "doc_2"),
+        ("Mary wants a cake.", "doc_3"),
+    ]
+    
+    batch = rule_pipeline.process_batch(items, batch_size=2)
+    single = [rule_pipeline.process(text, doc_id) for text, doc_id in items]
+    
+    assert [g.context_frames[0].source_doc for g in batch] == ["doc_1", "doc_2", "doc_3"]
+    assert any(n.type == NodeType.EVENT for n in batch[1].nodes)
+    assert [_normalized(g) for g in batch] == [_normalized(g) for g in single]
+
+def test_process_batch_worker_processes(rule_pipeline, monkeypatch):
+    """n_process is only passed on to spaCy for batches of MULTIPROCESS_MIN_ITEMS or more."""
+    from app.pipeline import MULTIPROCESS_MIN_ITEMS
+    
+    nlp = rule_pipeline.nlp
+    pipe = nlp.pipe
+    used = []
+    
+    def recording_pipe(texts, **kwargs):
+        used.append(kwargs["n_process"])
+        return pipe(texts, **kwargs)
+    
+    monkeypatch.setattr(nlp, "pipe", recording_pipe)
+    
+    texts = ["Gregor Samsa woke.", "Mary opened the bank.", "Mary wants a cake."]
+    small = [(texts[0], "doc_0")]
+    large = [(texts[i % 3], f"doc_{i}") for i in range(MULTIPROCESS_MIN_ITEMS)]
+    
+    rule_pipeline.process_batch(small, n_process=2)
+    batch = rule_pipeline.process_batch(large, batch_size=25, n_process=2)
+    assert used == [1, 2]
+    
+    single = [rule_pipeline.process(text, doc_id) for text, doc_id in large]
+    assert [_normalized(g) for g in batch] == [_normalized(g) for g in single]
+
 if __name__ == "__main__":
     test_pipeline_processing()
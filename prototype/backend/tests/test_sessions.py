@@ -6,6 +6,7 @@ Tests the full CRUD workflow with SQLite persistence.
 import pytest
 from fastapi.testclient import TestClient
 import os
+import json
 import tempfile
 
 
@@ -59,6 +60,55 @@ def test_list_sessions(client):
     assert len(sessions) == 2
 
 
+def test_list_sessions_pagination(client):
+    """Test that limit/offset page through the session list."""
+    for i in range(3):
+        client.post("/v0/sessions", json={"text": f"Session {i}"})
+    
+    all_sessions = client.get("/v0/sessions").json()
+    page = client.get("/v0/sessions", params={"limit": 2, "offset": 1}).json()
+    assert page == all_sessions[1:3]
+    assert all(s["node_count"] == 0 for s in page)
+
+
+def test_list_sessions_cursor(client):
+    """Test that following X-Next-Cursor pages through sessions like offsets do."""
+    for i in range(4):
+        client.post("/v0/sessions", json={"text": f"Session {i}"})
+    
+    all_sessions = client.get("/v0/sessions").json()
+    first = client.get("/v0/sessions", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/v0/sessions", params={"limit": 2, "after": cursor}).json()
+    assert first.json() + second == all_sessions[:4]
+    
+    assert client.get("/v0/sessions", params={"after": "bogus"}).status_code == 400
+
+
+def test_list_sessions_negative_limit(client):
+    """Test that a negative limit can't turn off the page size cap."""
+    client.post("/v0/sessions", json={"text": "Session 1"})
+    
+    response = client.get("/v0/sessions", params={"limit": -1})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_stream_sessions(client):
+    """Test listing sessions as newline-delimited JSON."""
+    client.post("/v0/sessions", json={"text": "Session 1"})
+    client.post("/v0/sessions", json={"text": "Session 2"})
+    
+    response = client.get("/v0/sessions/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    
+    # Same sessions, in the same order, as the non-streaming listing
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(lines) >= 2
+    assert lines == client.get("/v0/sessions").json()
+
+
 def test_get_session(client):
     """Test retrieving a specific session."""
     # Create session
@@ -119,6 +169,54 @@ def test_session_with_graph(client):
     assert data["edge_count"] >= 0
 
 
+def test_analyze_text_single_round_trip(client):
+    """Test that /analyze_text creates, analyzes and returns the graph in one call."""
+    response = client.post("/v0/analyze_text", json={
+        "text": "I want to build a system. The system should be fast.",
+        "lang": "en",
+        "options": {"processing_mode": "Map"}
+    })
+    assert response.status_code == 200
+
+    data = response.json()
+    assert "docId" in data
+    assert len(data["nodes"]) > 0
+    assert "diagnostics" in data
+
+    # The graph is persisted under the returned doc ID
+    graph_resp = client.get(f"/v0/docs/{data['docId']}/graph")
+    assert graph_resp.status_code == 200
+    assert len(graph_resp.json()["nodes"]) == len(data["nodes"])
+
+
+def test_graph_etag(client):
+    """Test that GET /docs/{id}/graph sets an ETag and answers a matching If-None-Match with 304."""
+    import app.api
+    from app.models import MeaningGraph, Node, NodeType
+    
+    doc_id = client.post("/v0/docs", json={"text": "Cats purr.", "lang": "en"}).json()["id"]
+    app.api.storage.save_graph(doc_id, MeaningGraph(nodes=[
+        Node(id="n0", type=NodeType.ENTITY, label="cat")
+    ]))
+    
+    response = client.get(f"/v0/docs/{doc_id}/graph")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    
+    cached = client.get(f"/v0/docs/{doc_id}/graph", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    
+    # Saving the graph again changes the ETag
+    app.api.storage.save_graph(doc_id, MeaningGraph(nodes=[
+        Node(id="n0", type=NodeType.ENTITY, label="dog")
+    ]))
+    fresh = client.get(f"/v0/docs/{doc_id}/graph", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert fresh.json()["nodes"][0]["label"] == "dog"
+
+
 def test_export_json(client):
     """Test JSON export."""
     # Create session
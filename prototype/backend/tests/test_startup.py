@@ -0,0 +1,43 @@
+"""
+Tests for the app's startup work (lifespan in main.py).
+"""
+
+from fastapi.testclient import TestClient
+
+import app.api
+from main import app as fastapi_app
+
+
+class CountingPipeline:
+    """Stands in for the spaCy pipeline and counts warm-up analyses."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def process(self, text, doc_id):
+        self.calls += 1
+        raise RuntimeError("stub pipeline")
+
+
+def test_pipeline_warmed_once_per_startup(monkeypatch):
+    pipeline = CountingPipeline()
+    monkeypatch.setattr(app.api, "get_pipeline", lambda: pipeline)
+    
+    with TestClient(fastapi_app):
+        assert pipeline.calls == 1
+    
+    # A second startup warms again, once
+    with TestClient(fastapi_app):
+        assert pipeline.calls == 2
+
+
+def test_plugins_registered_once_per_startup(monkeypatch):
+    monkeypatch.setattr(app.api, "get_pipeline", lambda: CountingPipeline())
+    registered = []
+    monkeypatch.setattr(app.api.registry, "_plugins", {})
+    monkeypatch.setattr(app.api.registry, "register", lambda plugin: registered.append(plugin.engine_id))
+    
+    with TestClient(fastapi_app):
+        pass
+    
+    assert registered == ["truth-checker-stub", "discourse-engine-stub"]
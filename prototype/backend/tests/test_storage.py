@@ -0,0 +1,146 @@
+"""
+Tests for the SQLite storage backend's parsed-object cache.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from app.models import MeaningGraph, Node, NodeType
+from app.storage import MAX_PAGE_SIZE, InMemoryStorage, SQLiteStorage
+
+
+@pytest.fixture
+def storage():
+    """SQLiteStorage on a temporary database file."""
+    db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+    db.close()
+    store = SQLiteStorage(db.name)
+    yield store
+    
+    store.close()
+    os.unlink(db.name)
+
+
+def _graph(*labels):
+    return MeaningGraph(nodes=[
+        Node(id=f"n{i}", type=NodeType.ENTITY, label=label) for i, label in enumerate(labels)
+    ])
+
+
+def test_get_graph_cached_until_saved(storage):
+    """Repeated reads reuse the parsed graph; saving a new one replaces it."""
+    storage.save_document("d1", "text", "en")
+    storage.save_graph("d1", _graph("cat"))
+    
+    first = storage.get_graph("d1")
+    assert storage.get_graph("d1") is first
+    
+    storage.save_graph("d1", _graph("dog", "bird"))
+    assert [n.label for n in storage.get_graph("d1").nodes] == ["dog", "bird"]
+    
+    assert storage.delete_document("d1")
+    assert storage.get_document("d1") is None
+
+
+def test_cache_sees_writes_from_other_connections(storage):
+    """A row rewritten behind the cache's back (another process) is read again."""
+    storage.save_document("d1", "before", "en")
+    storage.save_graph("d1", _graph("cat"))
+    assert storage.get_document("d1").text == "before"
+    assert storage.get_graph("d1").nodes[0].label == "cat"
+    
+    other = SQLiteStorage(storage.db_path)
+    other.save_document("d1", "after", "en")
+    other.save_graph("d1", _graph("dog"))
+    other.close()
+    
+    assert storage.get_document("d1").text == "after"
+    assert storage.get_graph("d1").nodes[0].label == "dog"
+
+
+def test_legacy_json_graphs_are_migrated(storage):
+    """Graphs stored as plain JSON text by older versions still load."""
+    storage.save_document("d1", "text", "en")
+    path = storage.db_path
+    storage.close()
+    
+    # Recreate the graphs table as older versions laid it out
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE graphs")
+    conn.execute("""
+        CREATE TABLE graphs (
+            doc_id TEXT PRIMARY KEY,
+            graph_json TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    conn.execute(
+        "INSERT INTO graphs VALUES (?, ?, ?)",
+        ("d1", _graph("cat", "dog").model_dump_json(), "2025-01-01T00:00:00")
+    )
+    conn.commit()
+    conn.close()
+    
+    migrated = SQLiteStorage(path)
+    assert [n.label for n in migrated.get_graph("d1").nodes] == ["cat", "dog"]
+    assert migrated.get_session_metadata("d1").node_count == 2
+    migrated.close()
+
+
+def test_save_documents_batch(storage):
+    """save_documents writes a batch that reads back like single saves."""
+    docs = storage.save_documents([("a", "first", "en"), ("b", "second", "de")])
+    assert [d.id for d in docs] == ["a", "b"]
+    assert storage.get_document("b").lang == "de"
+    assert {d.id for d in storage.list_documents()} == {"a", "b"}
+
+
+def test_concurrent_access_from_threads(storage):
+    """Worker threads each use their own connection without interfering."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def work(i):
+        doc_id = f"d{i}"
+        storage.save_document(doc_id, f"text {i}", "en")
+        storage.save_graph(doc_id, _graph(f"label{i}"))
+        return storage.get_graph(doc_id).nodes[0].label
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        labels = list(pool.map(work, range(32)))
+    
+    assert labels == [f"label{i}" for i in range(32)]
+    assert len(storage.list_session_rows(limit=100)) == 32
+
+
+def test_listing_page_size_is_capped(storage):
+    """Listings return at most MAX_PAGE_SIZE rows, and a negative limit returns none."""
+    storage.save_documents([(f"d{i}", "text", "en") for i in range(MAX_PAGE_SIZE + 5)])
+    
+    assert len(storage.list_session_rows(limit=1000)) == MAX_PAGE_SIZE
+    assert len(storage.list_documents(limit=1000)) == MAX_PAGE_SIZE
+    assert storage.list_session_rows(limit=-1) == []
+    assert storage.list_documents(limit=-1) == []
+
+
+def test_session_rows_match_session_metadata(storage):
+    """Listing rows (served without validation) have exactly SessionMetadata's JSON shape."""
+    storage.save_documents([("d1", "text", "en"), ("d2", "text", "en")])
+    storage.save_graph("d1", _graph("cat", "dog"))
+    
+    rows = storage.list_session_rows()
+    assert len(rows) == 2
+    for row in rows:
+        assert row == storage.get_session_metadata(row["id"]).model_dump(mode="json")
+
+
+def test_in_memory_listing_page_size_is_capped():
+    """InMemoryStorage applies the same page cap and negative-limit handling as SQLite."""
+    memory = InMemoryStorage()
+    memory.save_documents([(f"d{i}", "text", "en") for i in range(MAX_PAGE_SIZE + 5)])
+    
+    assert len(memory.list_documents(limit=1000)) == MAX_PAGE_SIZE
+    assert memory.list_documents(limit=-1) == []
+    assert [d.id for d in memory.list_documents(limit=2, offset=-3)] == ["d0", "d1"]